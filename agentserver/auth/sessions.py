@@ -120,18 +120,36 @@ class SessionManager:
         Returns:
             Session if valid, None if invalid/expired
         """
+        # One clock read serves both the expiry check and touch()
+        now = datetime.now(timezone.utc)
         with self._lock:
             session = self._sessions.get(token)
             if not session:
                 return None
             
-            if session.is_expired():
+            if now > session.expires_at:
                 del self._sessions[token]
                 return None
             
-            session.touch()
+            session.last_activity = now
             return session
     
+    def refresh(self, token: str) -> Optional[Session]:
+        """
+        Exchange a valid token for a fresh one (token rotation).
+
+        The old token stops working immediately.
+
+        Returns:
+            New Session, or None if the token is invalid/expired
+        """
+        with self._lock:
+            old = self._sessions.pop(token, None)
+            if not old or old.is_expired():
+                return None
+
+        return self.create(old.username, old.role)
+
     def revoke(self, token: str) -> bool:
         """
         Revoke a session (logout).
@@ -18,6 +18,7 @@ def cmd_run(args: argparse.Namespace) -> int:
     """Run an organism from config."""
     from agentserver.config.loader import load_config
     from agentserver.message_bus import bootstrap
+    from agentserver.utils.eventloop import install_fast_event_loop
 
     config_path = Path(args.config)
     if not config_path.exists():
@@ -26,6 +27,7 @@ def cmd_run(args: argparse.Namespace) -> int:
 
     try:
         config = load_config(config_path)
+        install_fast_event_loop()
         asyncio.run(bootstrap(config))
         return 0
     except KeyboardInterrupt:
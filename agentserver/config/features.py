@@ -5,6 +5,7 @@ This module checks which optional dependencies are installed and provides
 graceful degradation when features are unavailable.
 """
 
+import sys
 from dataclasses import dataclass, field
 from importlib.util import find_spec
 from typing import Callable
@@ -23,6 +24,11 @@ FEATURES: dict[str, tuple[Callable[[], bool], str]] = {
     "search": (lambda: _check_import("duckduckgo_search"), "DuckDuckGo search"),
     "auth": (lambda: _check_import("pyotp") and _check_import("argon2"), "TOTP auth"),
     "server": (lambda: _check_import("websockets"), "WebSocket server"),
+    "msgpack": (lambda: _check_import("msgpack"), "MessagePack WebSocket framing"),
+    "uvloop": (
+        lambda: _check_import("winloop" if sys.platform == "win32" else "uvloop"),
+        "libuv event loop",
+    ),
     "lsp": (lambda: _check_import("lsp_client"), "LSP client for config editor"),
 }
 
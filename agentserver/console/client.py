@@ -10,11 +10,14 @@ import asyncio
 import getpass
 import json
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 try:
     import aiohttp
+    from multidict import CIMultiDict  # ships with aiohttp
     AIOHTTP_AVAILABLE = True
 except ImportError:
     AIOHTTP_AVAILABLE = False
@@ -28,16 +31,53 @@ except ImportError:
     PROMPT_TOOLKIT_AVAILABLE = False
 
 from ..config import get_agent_config_store, CONFIG_DIR
+from ..utils import framing
 
 
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8765
 MAX_LOGIN_ATTEMPTS = 3
+TOKEN_REFRESH_MARGIN = 180  # seconds before expiry to refresh the token
+TOKEN_REFRESH_MIN_DELAY = 30  # never refresh more often than this (seconds)
+WS_HEARTBEAT = 30.0  # seconds between keepalive pings
 
 # Default organism config path
 DEFAULT_ORGANISM_CONFIG = Path("config/organism.yaml")
 
 
+async def _read_line(prompt: str) -> str:
+    """
+    input() without blocking the event loop.
+
+    Reads on a daemon thread rather than asyncio.to_thread: the default
+    executor is joined when asyncio.run() exits, so after Ctrl+C a reader
+    stuck in input() would hold the process open until Enter was pressed.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def reader():
+        try:
+            result, error = input(prompt), None
+        except BaseException as e:  # EOFError, or KeyboardInterrupt on Windows
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(deliver, result, error)
+        except RuntimeError:
+            pass  # loop already closed
+
+    threading.Thread(target=reader, daemon=True).start()
+    return await future
+
+
 class ConsoleClient:
     """
     Text-based console client for the agent server.
@@ -53,11 +93,70 @@ class ConsoleClient:
         self.base_url = f"http://{host}:{port}"
         self.ws_url = f"ws://{host}:{port}/ws"
         self.token: Optional[str] = None
+        self.auth_headers: Optional[CIMultiDict] = None  # built once per token
+        self.token_expires_at: Optional[datetime] = None
+        self.token_expired = False  # set when background refresh fails
+        self._refresh_task: Optional[asyncio.Task] = None
         self.username: Optional[str] = None
         self.session: Optional[aiohttp.ClientSession] = None
         self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.binary_frames = False  # True once server accepts msgpack framing
         self.running = False
 
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use."""
+        # No socket tuning needed for small interactive frames: aiohttp sets
+        # TCP_NODELAY on every connection it makes (and the server accepts).
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    def _set_token(self, data: dict) -> None:
+        """Store the session token from a login/refresh response."""
+        self.token = data["token"]
+        self.auth_headers = CIMultiDict(Authorization=f"Bearer {self.token}")
+        expires_at = data.get("expires_at")
+        self.token_expires_at = datetime.fromisoformat(expires_at) if expires_at else None
+        self.token_expired = False
+
+    def _start_token_refresh(self) -> None:
+        """(Re)start the background task that keeps the token fresh."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+        if self.token_expires_at:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        """
+        Refresh the token shortly before it expires.
+
+        Runs in the background so the interactive session never stalls on
+        re-login. If a refresh fails the token is marked expired and the
+        next command falls back to interactive login.
+        """
+        while self.token_expires_at:
+            remaining = (self.token_expires_at - datetime.now(timezone.utc)).total_seconds()
+            # Short-lived tokens (or a client clock running ahead) would make
+            # the margin swallow the whole lifetime and refresh in a tight
+            # loop: refresh at half-life at the latest, and never back-to-back
+            margin = min(TOKEN_REFRESH_MARGIN, max(remaining, 0) / 2)
+            await asyncio.sleep(max(remaining - margin, TOKEN_REFRESH_MIN_DELAY))
+
+            try:
+                async with self.session.post(
+                    f"{self.base_url}/auth/refresh",
+                    headers=self.auth_headers,
+                ) as resp:
+                    if resp.status == 200:
+                        # Single-threaded loop: token and header swap together
+                        self._set_token(await resp.json())
+                        continue
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+            self.token_expired = True
+            return
+
     async def login(self) -> bool:
         """
         Perform SSH-style login.
@@ -67,6 +166,10 @@ class ConsoleClient:
         """
         print(f"Connecting to {self.host}:{self.port}...")
 
+        # One session for every attempt and the WebSocket afterwards,
+        # so the connection pool stays warm
+        self._ensure_session()
+
         for attempt in range(1, MAX_LOGIN_ATTEMPTS + 1):
             try:
                 username = input("Username: ")
@@ -80,44 +183,64 @@ class ConsoleClient:
                 continue
 
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{self.base_url}/auth/login",
-                        json={"username": username, "password": password},
-                    ) as resp:
-                        data = await resp.json()
-
-                        if resp.status == 200:
-                            self.token = data["token"]
-                            self.username = username
-                            print(f"Welcome, {username}!")
-                            return True
+                async with self.session.post(
+                    f"{self.base_url}/auth/login",
+                    json={"username": username, "password": password},
+                ) as resp:
+                    data = await resp.json()
+
+                    if resp.status == 200:
+                        self._set_token(data)
+                        self.username = username
+                        print(f"Welcome, {username}!")
+                        return True
+                    else:
+                        error = data.get("error", "Authentication failed")
+                        remaining = MAX_LOGIN_ATTEMPTS - attempt
+                        if remaining > 0:
+                            print(f"{error}. {remaining} attempt(s) remaining.")
                         else:
-                            error = data.get("error", "Authentication failed")
-                            remaining = MAX_LOGIN_ATTEMPTS - attempt
-                            if remaining > 0:
-                                print(f"{error}. {remaining} attempt(s) remaining.")
-                            else:
-                                print(f"{error}. No attempts remaining.")
+                            print(f"{error}. No attempts remaining.")
             except aiohttp.ClientError as e:
                 print(f"Connection error: {e}")
                 return False
 
         return False
 
+    async def _reauthenticate(self) -> bool:
+        """Log in again and reopen the WebSocket on the new token."""
+        if not await self.login():
+            return False
+
+        # The open socket was authenticated with the old token
+        if self.ws:
+            await self.ws.close()
+            self.ws = None
+        if not await self.connect_ws():
+            print("Failed to connect to server.")
+            return False
+
+        self._start_token_refresh()
+        return True
+
     async def connect_ws(self) -> bool:
         """Connect to WebSocket after authentication."""
         if not self.token:
             return False
 
         try:
-            self.session = aiohttp.ClientSession(
-                headers={"Authorization": f"Bearer {self.token}"}
+            self.ws = await self._ensure_session().ws_connect(
+                self.ws_url,
+                protocols=framing.SUPPORTED_PROTOCOLS,
+                headers=self.auth_headers,
+                # Commands are tiny; per-message deflate would cost more than it saves
+                compress=0,
+                heartbeat=WS_HEARTBEAT,
             )
-            self.ws = await self.session.ws_connect(self.ws_url)
+            self.binary_frames = self.ws.protocol == framing.MSGPACK_PROTOCOL
 
-            # Wait for connected message
-            msg = await self.ws.receive_json()
+            # Wait for connected message (always JSON)
+            msg = await self.ws.receive_json(loads=framing.loads_json)
             if msg.get("type") == "connected":
                 return True
             return False
@@ -130,8 +253,12 @@ class ConsoleClient:
         if not self.ws:
             return None
 
-        await self.ws.send_json(cmd)
-        return await self.ws.receive_json()
+        if self.binary_frames:
+            await self.ws.send_bytes(framing.pack(cmd))
+            return framing.unpack(await self.ws.receive_bytes())
+
+        await self.ws.send_json(cmd, dumps=framing.dumps_json)
+        return await self.ws.receive_json(loads=framing.loads_json)
 
     def print_help(self):
         """Print available commands."""
@@ -161,6 +288,11 @@ Send messages:
         if not line:
             return True
 
+        if self.token_expired:
+            print("Session expired. Please log in again.")
+            if not await self._reauthenticate():
+                return False
+
         if line == "/help":
             self.print_help()
         elif line == "/quit" or line == "/exit":
@@ -235,9 +367,8 @@ Send messages:
 
         if EDITOR_AVAILABLE:
             # Use built-in editor
-            edited, saved = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: edit_text(content, title=f"organism.yaml")
+            edited, saved = await asyncio.to_thread(
+                edit_text, content, title="organism.yaml"
             )
 
             if saved and edited is not None:
@@ -261,9 +392,8 @@ Send messages:
 
         if EDITOR_AVAILABLE:
             # Use built-in editor
-            edited, saved = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: edit_text(content, title=f"Agent: {agent_name}")
+            edited, saved = await asyncio.to_thread(
+                edit_text, content, title=f"Agent: {agent_name}"
             )
 
             if saved and edited is not None:
@@ -290,15 +420,19 @@ Send messages:
         # Login
         if not await self.login():
             print("Authentication failed.")
+            await self.session.close()
             sys.exit(1)
 
         # Connect WebSocket
         if not await self.connect_ws():
             print("Failed to connect to server.")
+            await self.session.close()
             sys.exit(1)
 
         print("Connected. Type /help for commands, /quit to exit.")
 
+        self._start_token_refresh()
+
         self.running = True
 
         try:
@@ -322,10 +456,7 @@ Send messages:
 
         while self.running:
             try:
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: session.prompt(f"{self.username}> ")
-                )
+                line = await asyncio.to_thread(session.prompt, f"{self.username}> ")
                 if not await self.handle_command(line):
                     break
             except (EOFError, KeyboardInterrupt):
@@ -335,7 +466,7 @@ Send messages:
         """Run with simple input (fallback)."""
         while self.running:
             try:
-                line = input(f"{self.username}> ")
+                line = await _read_line(f"{self.username}> ")
                 if not await self.handle_command(line):
                     break
             except (EOFError, KeyboardInterrupt):
@@ -343,6 +474,8 @@ Send messages:
 
     async def cleanup(self):
         """Clean up connections."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
         if self.ws:
             await self.ws.close()
         if self.session:
@@ -359,8 +492,16 @@ def main():
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Server port")
     args = parser.parse_args()
 
+    from ..utils.eventloop import install_fast_event_loop
+    install_fast_event_loop()
+
     client = ConsoleClient(host=args.host, port=args.port)
-    asyncio.run(client.run())
+    try:
+        asyncio.run(client.run())
+    except KeyboardInterrupt:
+        # Ctrl+C cancels the running task (client.run() cleans up on the way
+        # out) and asyncio.run() re-raises it here
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+"""
+envelope.py — Qualified names for the <message> envelope.
+
+Every pipeline step that inspects the envelope compares Clark-notation tags
+({namespace}local). These are built once here, and interned, instead of being
+rebuilt per message in each step.
+
+Part of AgentServer v2.1 message pump.
+"""
+
+import sys
+
+ENVELOPE_NS = "https://xml-pipeline.org/ns/envelope/v1"
+
+MESSAGE_TAG = sys.intern(f"{{{ENVELOPE_NS}}}message")
+META_TAG = sys.intern(f"{{{ENVELOPE_NS}}}meta")
+FROM_TAG = sys.intern(f"{{{ENVELOPE_NS}}}from")
+TO_TAG = sys.intern(f"{{{ENVELOPE_NS}}}to")
+THREAD_TAG = sys.intern(f"{{{ENVELOPE_NS}}}thread")
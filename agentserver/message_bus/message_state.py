@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, TYPE_CHECKING
+from typing import Any, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from lxml.etree import _Element as Element
@@ -20,7 +20,7 @@ default_listener_steps = [
 ]
 """
 
-@dataclass
+@dataclass(slots=True)
 class HandlerMetadata:
     """Trustworthy context passed to every handler."""
     thread_id: str
@@ -101,7 +101,7 @@ ROUTING_ERROR = SystemError(
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageState:
     """Universal intermediate representation flowing through all pipelines."""
     raw_bytes: bytes | None = None
@@ -113,7 +113,7 @@ class MessageState:
     from_id: str | None = None
     to_id: str | None = None  # Target listener name for routing
 
-    target_listeners: list['Listener'] | None = None   # Forward reference
+    target_listeners: Sequence['Listener'] | None = None   # Forward reference
 
     error: str | None = None
 
@@ -10,9 +10,27 @@ identical for equivalent documents — essential for validation and signing.
 Part of AgentServer v2.1 message pump.
 """
 
+import threading
+
 from lxml import etree
 from agentserver.message_bus.message_state import MessageState
 
+# Re-parse of the canonical bytes: one parser per thread (event loop or xml
+# worker), reused. Canonical input has no blank text to strip and nothing
+# uses xml:id, so the ID table is skipped.
+_local = threading.local()
+
+
+def _c14n_parser() -> etree.XMLParser:
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = etree.XMLParser(
+            resolve_entities=False,
+            huge_tree=False,
+            collect_ids=False,
+        )
+    return parser
+
 
 async def c14n_step(state: MessageState) -> MessageState:
     """
@@ -24,6 +42,11 @@ async def c14n_step(state: MessageState) -> MessageState:
 
     On failure, sets state.error and continues (downstream steps will short-circuit).
     """
+    return canonicalize(state)
+
+
+def canonicalize(state: MessageState) -> MessageState:
+    """Synchronous body of c14n_step — safe to run on an xml worker."""
     if state.envelope_tree is None:
         state.error = "c14n_step: no envelope_tree (previous repair failed)"
         return state
@@ -41,7 +64,7 @@ async def c14n_step(state: MessageState) -> MessageState:
 
         # Re-parse the canonical bytes to get a clean tree (prefixes normalized, etc.)
         # This ensures downstream steps see a consistent document
-        clean_tree = etree.fromstring(c14n_bytes)
+        clean_tree = etree.fromstring(c14n_bytes, parser=_c14n_parser())
 
         state.envelope_tree = clean_tree
         # raw_bytes already cleared by repair_step
@@ -12,12 +12,29 @@ for diagnostic <huh>).
 Part of AgentServer v2.1 message pump.
 """
 
+import os
+import threading
+
 from lxml import etree
 from agentserver.message_bus.message_state import MessageState
+from agentserver.message_bus.envelope import MESSAGE_TAG
 
 # Load envelope.xsd once at module import (startup time)
 # In real implementation, move this to a config loader or bus init
-_ENVELOPE_XSD = etree.XMLSchema(file="agentserver/schema/envelope.xsd")
+_ENVELOPE_XSD_PATH = os.path.abspath("agentserver/schema/envelope.xsd")
+_ENVELOPE_XSD = etree.XMLSchema(file=_ENVELOPE_XSD_PATH)
+
+# A schema's error_log belongs to the schema object, so concurrent validation
+# on xml workers would mix diagnostics: each other thread compiles its own copy.
+_local = threading.local()
+_local.schema = _ENVELOPE_XSD
+
+
+def _envelope_schema() -> etree.XMLSchema:
+    schema = getattr(_local, "schema", None)
+    if schema is None:
+        schema = _local.schema = etree.XMLSchema(file=_ENVELOPE_XSD_PATH)
+    return schema
 
 
 async def envelope_validation_step(state: MessageState) -> MessageState:
@@ -32,22 +49,28 @@ async def envelope_validation_step(state: MessageState) -> MessageState:
     On failure: sets state.error with schema validation details.
     Downstream steps should short-circuit if error is set.
     """
+    return validate_envelope(state)
+
+
+def validate_envelope(state: MessageState) -> MessageState:
+    """Synchronous body of envelope_validation_step — safe to run on an xml worker."""
     if state.envelope_tree is None:
         state.error = "envelope_validation_step: no envelope_tree (previous step failed)"
         return state
 
+    schema = _envelope_schema()
     try:
         # lxml schema validation — raises XMLSchemaError on failure
-        _ENVELOPE_XSD.assertValid(state.envelope_tree)
+        schema.assertValid(state.envelope_tree)
 
         # Optional extra checks (can be removed later if redundant)
-        if state.envelope_tree.tag != "{https://xml-pipeline.org/ns/envelope/v1}message":
+        if state.envelope_tree.tag != MESSAGE_TAG:
             raise ValueError("Root element is not <message> in expected namespace")
 
     except etree.DocumentInvalid as exc:
         # Schema violation — collect all error messages for diagnostics
         error_lines = []
-        for error in _ENVELOPE_XSD.error_log:
+        for error in schema.error_log:
             error_lines.append(f"{error.level_name}: {error.message} (line {error.line})")
         state.error = "envelope_validation_step: invalid envelope\n" + "\n".join(error_lines)
 
@@ -13,14 +13,13 @@ Part of AgentServer v2.1 message pump.
 
 from lxml import etree
 from agentserver.message_bus.message_state import MessageState
+from agentserver.message_bus.envelope import ENVELOPE_NS, MESSAGE_TAG, META_TAG
 
-# Envelope namespace for easy reference
-_ENVELOPE_NS = "https://xml-pipeline.org/ns/envelope/v1"
-_MESSAGE_TAG = f"{{{_ENVELOPE_NS}}}message"
-_META_TAG = f"{{{_ENVELOPE_NS}}}meta"
-_FROM_TAG = f"{{{_ENVELOPE_NS}}}from"
-_TO_TAG = f"{{{_ENVELOPE_NS}}}to"
-_THREAD_TAG = f"{{{_ENVELOPE_NS}}}thread"
+# Compiled once — calling these skips ElementPath's per-call path handling
+_NS = {"env": ENVELOPE_NS}
+_FROM_XPATH = etree.XPath("string(env:meta/env:from)", namespaces=_NS, smart_strings=False)
+_THREAD_XPATH = etree.XPath("string(env:meta/env:thread)", namespaces=_NS, smart_strings=False)
+_TO_XPATH = etree.XPath("string(env:meta/env:to)", namespaces=_NS, smart_strings=False)
 
 
 async def payload_extraction_step(state: MessageState) -> MessageState:
@@ -42,53 +41,64 @@ async def payload_extraction_step(state: MessageState) -> MessageState:
     On success: state.payload_tree is set to the payload Element.
     On failure: state.error is set with a clear diagnostic.
     """
+    return extract_payload(state)
+
+
+def extract_payload(state: MessageState) -> MessageState:
+    """Synchronous body of payload_extraction_step — safe to run on an xml worker."""
     if state.envelope_tree is None:
         state.error = "payload_extraction_step: no envelope_tree (previous step failed)"
         return state
 
     # Basic sanity — root must be <message> in correct namespace
-    if state.envelope_tree.tag != _MESSAGE_TAG:
+    if state.envelope_tree.tag != MESSAGE_TAG:
         state.error = "payload_extraction_step: root tag is not <message> in envelope namespace"
         return state
 
-    # Find <meta> block and extract provenance
-    meta_elem = state.envelope_tree.find(_META_TAG)
+    # One pass over the envelope's children finds both <meta> and the payload
+    # candidates (every direct child that is NOT <meta>). Stops as soon as the
+    # outcome is known: <meta> seen and a second payload root found.
+    meta_elem = None
+    payload_elem = None
+    payload_count = 0
+    for child in state.envelope_tree:
+        if child.tag == META_TAG:
+            meta_elem = child
+        else:
+            payload_count += 1
+            if payload_elem is None:
+                payload_elem = child
+            elif meta_elem is not None:
+                break
+
     if meta_elem is None:
         state.error = "payload_extraction_step: missing <meta> block in envelope"
         return state
 
     # Extract from_id (required)
-    from_elem = meta_elem.find(_FROM_TAG)
-    if from_elem is not None and from_elem.text:
-        state.from_id = from_elem.text.strip()
-    else:
+    from_id = _FROM_XPATH(state.envelope_tree)
+    if not from_id:
         state.error = "payload_extraction_step: missing <from> in <meta>"
         return state
+    state.from_id = from_id.strip()
 
     # Extract thread_id (required)
-    thread_elem = meta_elem.find(_THREAD_TAG)
-    if thread_elem is not None and thread_elem.text:
-        state.thread_id = thread_elem.text.strip()
-    else:
+    thread_id = _THREAD_XPATH(state.envelope_tree)
+    if not thread_id:
         state.error = "payload_extraction_step: missing <thread> in <meta>"
         return state
+    state.thread_id = thread_id.strip()
 
     # Optional: extract <to> for direct routing
-    to_elem = meta_elem.find(_TO_TAG)
-    if to_elem is not None and to_elem.text:
-        state.to_id = to_elem.text.strip()
-
-    # Find all direct children that are NOT <meta> — those are payload candidates
-    payload_candidates = [
-        child for child in state.envelope_tree
-        if child.tag != _META_TAG
-    ]
+    to_id = _TO_XPATH(state.envelope_tree)
+    if to_id:
+        state.to_id = to_id.strip()
 
-    if len(payload_candidates) == 0:
+    if payload_count == 0:
         state.error = "payload_extraction_step: no payload element found inside <message>"
         return state
 
-    if len(payload_candidates) > 1:
+    if payload_count > 1:
         state.error = (
             "payload_extraction_step: multiple payload roots found — "
             "exactly one capability payload element is allowed"
@@ -96,6 +106,6 @@ async def payload_extraction_step(state: MessageState) -> MessageState:
         return state
 
     # Success — exactly one payload element
-    state.payload_tree = payload_candidates[0]
+    state.payload_tree = payload_elem
 
-    return state
\ No newline at end of file
+    return state
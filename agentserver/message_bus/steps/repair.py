@@ -1,30 +1,42 @@
+import threading
+
 from lxml import etree
 from agentserver.message_bus.message_state import MessageState
+from agentserver.message_bus.xml_executor import OFFLOAD_THRESHOLD, run_xml
 
-# lxml parser configured for maximum tolerance + recovery
-_RECOVERY_PARSER = etree.XMLParser(
-    recover=True,           # Try to recover from malformed XML
-    remove_blank_text=True, # Normalize whitespace
-    resolve_entities=False, # Security: don't resolve external entities
-    huge_tree=False,        # Default is safe
-)
+# lxml parsers are not thread-safe, so each thread (event loop or xml worker)
+# gets its own recovery parser, created on first use and then reused.
+_local = threading.local()
 
-async def repair_step(state: MessageState) -> MessageState:
-    """
-    First pipeline step: repair malformed ingress bytes into a recoverable lxml ElementTree.
 
-    Takes raw_bytes from ingress (or multi-payload extraction) and attempts to produce
-    a valid envelope_tree. Uses lxml's recovery mode to tolerate dirty streams.
+def _recovery_parser() -> etree.XMLParser:
+    """Return this thread's lxml parser configured for maximum tolerance + recovery."""
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = etree.XMLParser(
+            recover=True,           # Try to recover from malformed XML
+            remove_blank_text=True, # Normalize whitespace
+            resolve_entities=False, # Security: don't resolve external entities
+            huge_tree=False,        # Default is safe
+            collect_ids=False,      # No xml:id lookups; skip the ID hash
+        )
+    return parser
 
-    Always returns a MessageState (even on total failure — injects diagnostic error).
-    """
+
+def _parse_recovering(raw_bytes: bytes) -> etree._Element:
+    """Synchronous parse — safe to run on the event loop or an xml worker."""
+    return etree.fromstring(raw_bytes, parser=_recovery_parser())
+
+
+def repair(state: MessageState) -> MessageState:
+    """Synchronous body of repair_step — safe to run on an xml worker."""
     if state.raw_bytes is None:
         state.error = "repair_step: no raw_bytes available"
         return state
 
     try:
         # lxml recovery parser turns most garbage into something parseable
-        tree = etree.fromstring(state.raw_bytes, parser=_RECOVERY_PARSER)
+        tree = _parse_recovering(state.raw_bytes)
 
         if tree is None:
             raise ValueError("Parser returned None — unrecoverable XML")
@@ -39,4 +51,20 @@ async def repair_step(state: MessageState) -> MessageState:
         # We still set envelope_tree to None so later steps know to short-circuit
         state.envelope_tree = None
 
-    return state
\ No newline at end of file
+    return state
+
+
+async def repair_step(state: MessageState) -> MessageState:
+    """
+    First pipeline step: repair malformed ingress bytes into a recoverable lxml ElementTree.
+
+    Takes raw_bytes from ingress (or multi-payload extraction) and attempts to produce
+    a valid envelope_tree. Uses lxml's recovery mode to tolerate dirty streams.
+
+    Large messages are parsed on the xml worker pool so they don't block the event loop.
+
+    Always returns a MessageState (even on total failure — injects diagnostic error).
+    """
+    if state.raw_bytes is not None and len(state.raw_bytes) >= OFFLOAD_THRESHOLD:
+        return await run_xml(repair, state)
+    return repair(state)
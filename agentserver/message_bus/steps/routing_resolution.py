@@ -16,7 +16,7 @@ Part of AgentServer v2.1 message pump.
 
 from __future__ import annotations
 
-from typing import Dict, List, Callable, Awaitable, TYPE_CHECKING
+from typing import Dict, Sequence, Callable, Awaitable, TYPE_CHECKING
 
 from agentserver.message_bus.message_state import MessageState
 
@@ -25,13 +25,14 @@ if TYPE_CHECKING:
 
 
 def make_routing_step(
-    routing_table: Dict[str, List["Listener"]]
+    routing_table: Dict[str, Sequence["Listener"]]
 ) -> Callable[[MessageState], Awaitable[MessageState]]:
     """
     Factory: create a routing step with a specific routing table.
 
-    The routing table maps root tags to lists of listeners:
-        {"agent.payload": [listener1, listener2], ...}
+    The routing table maps root tags to sequences of listeners
+    (StreamPump stores tuples):
+        {"agent.payload": (listener1, listener2), ...}
     """
 
     async def routing_resolution_step(state: MessageState) -> MessageState:
@@ -18,6 +18,7 @@ Part of AgentServer v2.1 message pump.
 
 import uuid
 from agentserver.message_bus.message_state import MessageState
+from agentserver.utils.ids import uuid4_str
 
 
 def _is_valid_uuid(val: str) -> bool:
@@ -39,12 +40,17 @@ async def thread_assignment_step(state: MessageState) -> MessageState:
 
     This is the source of truth for thread identity throughout the organism.
     """
+    return assign_thread(state)
+
+
+def assign_thread(state: MessageState) -> MessageState:
+    """Synchronous body of thread_assignment_step."""
     if state.thread_id and _is_valid_uuid(state.thread_id):
         # Already valid — nothing to do
         return state
 
     # Invalid, missing, or malformed — generate new root thread
-    new_thread_id = str(uuid.uuid4())
+    new_thread_id = uuid4_str()
 
     # Optional: log warning if external client sent bad thread
     if state.thread_id:
@@ -14,21 +14,26 @@ Dependencies:
 from __future__ import annotations
 
 import asyncio
+import functools
 import importlib
+import sys
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import AsyncIterable, Callable, List, Dict, Any, Optional
+from typing import AsyncIterable, Callable, List, Dict, Any, Optional, Tuple
 
 import yaml
 from lxml import etree
 from aiostream import stream, pipe, operator
 
 # Import existing step implementations (we'll wrap them)
-from agentserver.message_bus.steps.repair import repair_step
-from agentserver.message_bus.steps.c14n import c14n_step
-from agentserver.message_bus.steps.envelope_validation import envelope_validation_step
-from agentserver.message_bus.steps.payload_extraction import payload_extraction_step
-from agentserver.message_bus.steps.thread_assignment import thread_assignment_step
+from agentserver.message_bus.steps.repair import repair
+from agentserver.message_bus.steps.c14n import canonicalize
+from agentserver.message_bus.steps.envelope_validation import validate_envelope
+from agentserver.message_bus.steps.payload_extraction import extract_payload
+from agentserver.message_bus.steps.thread_assignment import assign_thread
+from agentserver.message_bus.xml_executor import OFFLOAD_THRESHOLD, run_xml
+from agentserver.message_bus.envelope import ENVELOPE_NS
 from agentserver.message_bus.message_state import MessageState, HandlerMetadata, HandlerResponse, SystemError, ROUTING_ERROR
 from agentserver.message_bus.thread_registry import get_registry
 from agentserver.message_bus.todo_registry import get_todo_registry
@@ -70,7 +75,7 @@ class OrganismConfig:
     llm_config: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Listener:
     name: str
     payload_class: type
@@ -80,6 +85,7 @@ class Listener:
     peers: List[str] = field(default_factory=list)
     broadcast: bool = False
     schema: etree.XMLSchema = field(default=None, repr=False)
+    deserialize: Callable = field(default=None, repr=False)  # Bound at registration
     root_tag: str = ""
     usage_instructions: str = ""  # Generated at registration for LLM agents
 
@@ -98,6 +104,51 @@ def wrap_step(step_fn: Callable) -> Callable:
     return step_fn
 
 
+def prepare_envelope(state: MessageState) -> MessageState:
+    """
+    repair → c14n → envelope.xsd → payload extraction → thread assignment,
+    back to back, with no awaits in between.
+    """
+    return assign_thread(extract_payload(validate_envelope(canonicalize(repair(state)))))
+
+
+async def prepare_envelope_step(state: MessageState) -> MessageState:
+    """
+    The synchronous envelope steps as one pipeline stage.
+
+    Each stream stage costs an async-generator hop per message, and none of
+    these steps ever awaits, so they run as one plain function call.
+
+    Large messages run the whole group on an xml worker (lxml releases the
+    GIL while parsing, serializing and validating): one thread hop instead
+    of one per step, and none of them blocks the event loop.
+    """
+    if state.raw_bytes is not None and len(state.raw_bytes) >= OFFLOAD_THRESHOLD:
+        return await run_xml(prepare_envelope, state)
+    return prepare_envelope(state)
+
+
+@functools.lru_cache(maxsize=1024)
+def _routing_tag(tag: str) -> str:
+    """Clark-notation payload tag → lowercased local name, as routing keys use."""
+    if tag.startswith("{"):
+        tag = tag.split("}", 1)[1]
+    return tag.lower()
+
+
+# Per-thread recovering parser for extract_payloads (lxml parsers aren't thread-safe)
+_extract_local = threading.local()
+
+
+def _extract_parser() -> etree.XMLParser:
+    parser = getattr(_extract_local, "parser", None)
+    if parser is None:
+        parser = _extract_local.parser = etree.XMLParser(
+            recover=True, resolve_entities=False, collect_ids=False,
+        )
+    return parser
+
+
 async def extract_payloads(state: MessageState) -> AsyncIterable[MessageState]:
     """
     Fan-out step: Extract 1..N payloads from handler response.
@@ -111,7 +162,7 @@ async def extract_payloads(state: MessageState) -> AsyncIterable[MessageState]:
     try:
         # Wrap in dummy to handle multiple roots
         wrapped = b"<dummy>" + state.raw_bytes + b"</dummy>"
-        tree = etree.fromstring(wrapped, parser=etree.XMLParser(recover=True))
+        tree = etree.fromstring(wrapped, parser=_extract_parser())
 
         children = list(tree)
         if not children:
@@ -147,13 +198,14 @@ def make_xsd_validation(schema: etree.XMLSchema) -> Callable:
 
 def make_deserialization(payload_class: type) -> Callable:
     """Factory for deserialization step with class baked in."""
-    from third_party.xmlable import parse_element
+    from third_party.xmlable import element_parser
+    parse = element_parser(payload_class)
 
     async def deserialize(state: MessageState) -> MessageState:
         if state.payload_tree is None or state.error:
             return state
         try:
-            state.payload = parse_element(payload_class, state.payload_tree)
+            state.payload = parse(state.payload_tree)
         except Exception as e:
             state.error = f"Deserialization failed: {e}"
         return state
@@ -164,6 +216,16 @@ def make_deserialization(payload_class: type) -> Callable:
 # The Stream-Based Pump
 # ============================================================================
 
+# Constant start of every compact envelope, up to the <from> value
+_ENVELOPE_OPEN = f'<message xmlns="{ENVELOPE_NS}"><meta><from>'
+
+# Max messages drained from the queue per wakeup of the pipeline source
+INGRESS_BATCH_MAX = 64
+
+# Max queued error reports before new ones are dropped (and counted)
+ERROR_LOG_QUEUE_SIZE = 4096
+
+
 class StreamPump:
     """
     Message pump built on aiostream.
@@ -172,19 +234,35 @@ class StreamPump:
     Fan-out is natural via flatmap. Concurrency is controlled via task_limit.
     """
 
-    def __init__(self, config: OrganismConfig):
+    def __init__(self, config: OrganismConfig, pretty: bool = False):
         self.config = config
 
+        # Pretty-print generated envelopes (debugging only — costs bytes + CPU)
+        self.pretty = pretty
+
         # Message queue feeds the stream
         self.queue: asyncio.Queue[MessageState] = asyncio.Queue()
 
-        # Routing table
-        self.routing_table: Dict[str, List[Listener]] = {}
+        # Routing table: root_tag -> immutable tuple of listeners.
+        # Rebuilt on registration (rare) so the per-message path can hand the
+        # same tuple to every MessageState without copying.
+        self.routing_table: Dict[str, Tuple[Listener, ...]] = {}
         self.listeners: Dict[str, Listener] = {}
+        self.listeners_version = 0  # Bumped whenever `listeners` changes
 
         # Per-agent semaphores for rate limiting
         self.agent_semaphores: Dict[str, asyncio.Semaphore] = {}
 
+        # Error reports are queued and written in batches by a writer task,
+        # which does the stdout write on a worker thread: a slow terminal
+        # stalls the writer, never the pipeline. Bounded: when the writer
+        # falls behind, reports are counted and dropped.
+        self._error_log: asyncio.Queue[str] = asyncio.Queue(maxsize=ERROR_LOG_QUEUE_SIZE)
+        self._error_writer: Optional[asyncio.Task] = None
+        self._error_write: Optional[asyncio.Future] = None  # batch being written
+        self.dropped_error_reports = 0
+        self._reported_drops = 0
+
         # Shutdown control
         self._running = False
 
@@ -193,7 +271,10 @@ class StreamPump:
     # ------------------------------------------------------------------
 
     def register_listener(self, lc: ListenerConfig) -> Listener:
-        root_tag = f"{lc.name.lower()}.{lc.payload_class.__name__.lower()}"
+        from third_party.xmlable import element_parser
+
+        # Interned so routing-table keys compare by identity where possible
+        root_tag = sys.intern(f"{lc.name.lower()}.{lc.payload_class.__name__.lower()}")
 
         listener = Listener(
             name=lc.name,
@@ -204,6 +285,7 @@ class StreamPump:
             peers=lc.peers,
             broadcast=lc.broadcast,
             schema=self._generate_schema(lc.payload_class),
+            deserialize=element_parser(lc.payload_class),
             root_tag=root_tag,
         )
 
@@ -212,8 +294,9 @@ class StreamPump:
                 self.config.max_concurrent_per_agent
             )
 
-        self.routing_table.setdefault(root_tag, []).append(listener)
+        self.routing_table[root_tag] = self.routing_table.get(root_tag, ()) + (listener,)
         self.listeners[lc.name] = listener
+        self.listeners_version += 1
         return listener
 
     def register_all(self) -> None:
@@ -292,14 +375,28 @@ class StreamPump:
     # ------------------------------------------------------------------
 
     async def _queue_source(self) -> AsyncIterable[MessageState]:
-        """Async generator that yields messages from the queue."""
+        """
+        Async generator that yields messages from the queue.
+
+        Waits (with timeout, to notice shutdown) only when the queue is
+        empty; a burst of already-queued messages is drained with
+        get_nowait(), up to INGRESS_BATCH_MAX, without a wait_for per message.
+        """
         while self._running:
             try:
                 state = await asyncio.wait_for(self.queue.get(), timeout=0.5)
-                yield state
-                self.queue.task_done()
             except asyncio.TimeoutError:
                 continue
+            yield state
+            self.queue.task_done()
+
+            for _ in range(INGRESS_BATCH_MAX - 1):
+                try:
+                    state = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                yield state
+                self.queue.task_done()
 
     # ------------------------------------------------------------------
     # Pipeline Steps (as stream operators)
@@ -310,6 +407,10 @@ class StreamPump:
         if state.error or state.payload is None:
             return state
 
+        # Already resolved by _validate_and_deserialize — skip the second lookup
+        if state.target_listeners:
+            return state
+
         payload_class_name = type(state.payload).__name__.lower()
         to_id = (state.to_id or "").lower()
         root_tag = f"{to_id}.{payload_class_name}" if to_id else payload_class_name
@@ -339,215 +440,254 @@ class StreamPump:
             yield state
             return
 
-        for listener in state.target_listeners:
+        listeners = state.target_listeners
+        if len(listeners) == 1:
+            result = await self._dispatch_one(state, listeners[0])
+            if result is not None:
+                yield result
+            return
+
+        # Broadcast: run listeners concurrently and yield each response as
+        # soon as it is ready, so one slow listener doesn't hold up the rest.
+        tasks = [
+            asyncio.create_task(self._dispatch_one(state, listener))
+            for listener in listeners
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is not None:
+                    yield result
+        finally:
+            # Only does anything if the stream stopped consuming early
+            for task in tasks:
+                task.cancel()
+
+    async def _dispatch_one(self, state: MessageState, listener: Listener) -> Optional[MessageState]:
+        """
+        Invoke a single listener's handler for a routed message.
+
+        Returns the response state to re-inject, or None when the handler
+        has nothing to send (or the call chain is exhausted). Never raises —
+        a crashing handler comes back as an error state — so callers only
+        need an ``is not None`` check on the result.
+        """
+        try:
+            # Rate limiting for agents
+            semaphore = self.agent_semaphores.get(listener.name)
+            if semaphore:
+                await semaphore.acquire()
+
             try:
-                # Rate limiting for agents
-                semaphore = self.agent_semaphores.get(listener.name)
-                if semaphore:
-                    await semaphore.acquire()
+                # Ensure we have a valid thread chain
+                registry = get_registry()
+                todo_registry = get_todo_registry()
+                context_buffer = get_context_buffer()
+                current_thread = state.thread_id or ""
+
+                # Check if thread exists in registry; if not, register it
+                if current_thread and not registry.lookup(current_thread):
+                    # New conversation - register existing UUID to chain
+                    # The UUID was assigned by thread_assignment_step
+                    from_id = state.from_id or "external"
+                    registry.register_thread(current_thread, from_id, listener.name)
+
+                # Check for todo matches on this message
+                # This may raise eyebrows on watchers for this thread
+                if current_thread and state.payload:
+                    payload_type = type(state.payload).__name__
+                    todo_registry.check(
+                        thread_id=current_thread,
+                        payload_type=payload_type,
+                        from_id=state.from_id or "",
+                        payload=state.payload,
+                    )
 
-                try:
-                    # Ensure we have a valid thread chain
-                    registry = get_registry()
-                    todo_registry = get_todo_registry()
-                    context_buffer = get_context_buffer()
-                    current_thread = state.thread_id or ""
-
-                    # Check if thread exists in registry; if not, register it
-                    if current_thread and not registry.lookup(current_thread):
-                        # New conversation - register existing UUID to chain
-                        # The UUID was assigned by thread_assignment_step
-                        from_id = state.from_id or "external"
-                        registry.register_thread(current_thread, from_id, listener.name)
-
-                    # Check for todo matches on this message
-                    # This may raise eyebrows on watchers for this thread
-                    if current_thread and state.payload:
-                        payload_type = type(state.payload).__name__
-                        todo_registry.check(
+                # Detect self-calls (agent sending to itself)
+                is_self_call = (state.from_id or "") == listener.name
+
+                # Get any raised eyebrows for this agent (for nagging)
+                todo_nudge = ""
+                if listener.is_agent and current_thread:
+                    raised = todo_registry.get_raised_for(current_thread, listener.name)
+                    todo_nudge = todo_registry.format_nudge(raised)
+
+                # === CONTEXT BUFFER: Record incoming message ===
+                # Append validated payload to thread's context buffer
+                # The returned BufferSlot becomes the single source of truth
+                slot = None
+                if current_thread and state.payload:
+                    try:
+                        slot = context_buffer.append(
                             thread_id=current_thread,
-                            payload_type=payload_type,
-                            from_id=state.from_id or "",
                             payload=state.payload,
-                        )
-
-                    # Detect self-calls (agent sending to itself)
-                    is_self_call = (state.from_id or "") == listener.name
-
-                    # Get any raised eyebrows for this agent (for nagging)
-                    todo_nudge = ""
-                    if listener.is_agent and current_thread:
-                        raised = todo_registry.get_raised_for(current_thread, listener.name)
-                        todo_nudge = todo_registry.format_nudge(raised)
-
-                    # === CONTEXT BUFFER: Record incoming message ===
-                    # Append validated payload to thread's context buffer
-                    # The returned BufferSlot becomes the single source of truth
-                    slot = None
-                    if current_thread and state.payload:
-                        try:
-                            slot = context_buffer.append(
-                                thread_id=current_thread,
-                                payload=state.payload,
-                                from_id=state.from_id or "unknown",
-                                to_id=listener.name,
-                                own_name=listener.name if listener.is_agent else None,
-                                is_self_call=is_self_call,
-                                usage_instructions=listener.usage_instructions,
-                                todo_nudge=todo_nudge,
-                            )
-                        except MemoryError:
-                            # Thread exceeded max slots - log and continue
-                            import logging
-                            logging.getLogger(__name__).warning(
-                                f"Thread {current_thread[:8]}... exceeded context buffer limit"
-                            )
-
-                    # Derive metadata from slot (single source of truth)
-                    # Fall back to manual construction if no slot (e.g., buffer overflow)
-                    if slot:
-                        from agentserver.memory import slot_to_handler_metadata
-                        metadata = slot_to_handler_metadata(slot)
-                        payload_ref = slot.payload  # Same reference as in buffer
-                    else:
-                        metadata = HandlerMetadata(
-                            thread_id=current_thread,
-                            from_id=state.from_id or "",
+                            from_id=state.from_id or "unknown",
+                            to_id=listener.name,
                             own_name=listener.name if listener.is_agent else None,
                             is_self_call=is_self_call,
                             usage_instructions=listener.usage_instructions,
                             todo_nudge=todo_nudge,
                         )
-                        payload_ref = state.payload
-
-                    response = await listener.handler(payload_ref, metadata)
-
-                    # None means "no response needed" - don't re-inject
-                    if response is None:
-                        continue
-
-                    # Handle clean HandlerResponse (preferred)
-                    if isinstance(response, HandlerResponse):
-                        registry = get_registry()
-
-                        if response.is_response:
-                            # Response back to caller - prune chain
-                            target, new_thread_id = registry.prune_for_response(current_thread)
-                            if target is None:
-                                # Chain exhausted - nowhere to respond to
-                                continue
-                            to_id = target
-                            thread_id = new_thread_id
-                        else:
-                            # Forward to named target - validate against peers
-                            requested_to = response.to
-
-                            # Enforce peer constraints for agents
-                            if listener.is_agent and listener.peers:
-                                if requested_to not in listener.peers:
-                                    # Agent trying to send to non-peer - send generic error back to agent
-                                    # Log details internally but don't reveal to agent
-                                    import logging
-                                    logging.getLogger(__name__).warning(
-                                        f"Peer violation: {listener.name} -> {requested_to} (allowed: {listener.peers})"
-                                    )
-
-                                    # Send SystemError back to the agent (keeps thread alive)
-                                    error_bytes = self._wrap_in_envelope(
-                                        payload=ROUTING_ERROR,
-                                        from_id="system",
-                                        to_id=listener.name,
-                                        thread_id=current_thread,
-                                    )
-                                    yield MessageState(
-                                        raw_bytes=error_bytes,
-                                        thread_id=current_thread,
-                                        from_id="system",
-                                    )
-                                    continue
-
-                            to_id = requested_to
-                            thread_id = registry.extend_chain(current_thread, to_id)
-
-                        # === CONTEXT BUFFER: Record outgoing response ===
-                        # Append handler's response to the target thread's buffer
-                        # This happens BEFORE serialization - the buffer holds the clean payload
-                        try:
-                            context_buffer.append(
-                                thread_id=thread_id,
-                                payload=response.payload,
-                                from_id=listener.name,
-                                to_id=to_id,
-                            )
-                        except MemoryError:
-                            import logging
-                            logging.getLogger(__name__).warning(
-                                f"Thread {thread_id[:8]}... exceeded context buffer limit"
-                            )
-
-                        response_bytes = self._wrap_in_envelope(
+                    except MemoryError:
+                        # Thread exceeded max slots - log and continue
+                        import logging
+                        logging.getLogger(__name__).warning(
+                            f"Thread {current_thread[:8]}... exceeded context buffer limit"
+                        )
+
+                # Derive metadata from slot (single source of truth)
+                # Fall back to manual construction if no slot (e.g., buffer overflow)
+                if slot:
+                    from agentserver.memory import slot_to_handler_metadata
+                    metadata = slot_to_handler_metadata(slot)
+                    payload_ref = slot.payload  # Same reference as in buffer
+                else:
+                    metadata = HandlerMetadata(
+                        thread_id=current_thread,
+                        from_id=state.from_id or "",
+                        own_name=listener.name if listener.is_agent else None,
+                        is_self_call=is_self_call,
+                        usage_instructions=listener.usage_instructions,
+                        todo_nudge=todo_nudge,
+                    )
+                    payload_ref = state.payload
+
+                response = await listener.handler(payload_ref, metadata)
+
+                # None means "no response needed" - don't re-inject
+                if response is None:
+                    return None
+
+                # Handle clean HandlerResponse (preferred)
+                if isinstance(response, HandlerResponse):
+                    if response.is_response:
+                        # Response back to caller - prune chain
+                        target, new_thread_id = registry.prune_for_response(current_thread)
+                        if target is None:
+                            # Chain exhausted - nowhere to respond to
+                            return None
+                        to_id = target
+                        thread_id = new_thread_id
+                    else:
+                        # Forward to named target - validate against peers
+                        requested_to = response.to
+
+                        # Enforce peer constraints for agents
+                        if listener.is_agent and listener.peers:
+                            if requested_to not in listener.peers:
+                                # Agent trying to send to non-peer - send generic error back to agent
+                                # Log details internally but don't reveal to agent
+                                import logging
+                                logging.getLogger(__name__).warning(
+                                    f"Peer violation: {listener.name} -> {requested_to} (allowed: {listener.peers})"
+                                )
+
+                                # Send SystemError back to the agent (keeps thread alive)
+                                error_bytes = self._wrap_in_envelope(
+                                    payload=ROUTING_ERROR,
+                                    from_id="system",
+                                    to_id=listener.name,
+                                    thread_id=current_thread,
+                                )
+                                return MessageState(
+                                    raw_bytes=error_bytes,
+                                    thread_id=current_thread,
+                                    from_id="system",
+                                )
+
+                        to_id = requested_to
+                        thread_id = registry.extend_chain(current_thread, to_id)
+
+                    # === CONTEXT BUFFER: Record outgoing response ===
+                    # Append handler's response to the target thread's buffer
+                    # This happens BEFORE serialization - the buffer holds the clean payload
+                    try:
+                        context_buffer.append(
+                            thread_id=thread_id,
                             payload=response.payload,
                             from_id=listener.name,
                             to_id=to_id,
-                            thread_id=thread_id,
                         )
-                    # Legacy: raw bytes (backwards compatible)
-                    elif isinstance(response, bytes):
-                        response_bytes = response
-                        thread_id = state.thread_id
-                    else:
-                        response_bytes = b"<huh>Handler returned invalid type</huh>"
-                        thread_id = state.thread_id
+                    except MemoryError:
+                        import logging
+                        logging.getLogger(__name__).warning(
+                            f"Thread {thread_id[:8]}... exceeded context buffer limit"
+                        )
 
-                    # Yield response — will be processed by next iteration
-                    yield MessageState(
-                        raw_bytes=response_bytes,
-                        thread_id=thread_id,
+                    response_bytes = self._wrap_in_envelope(
+                        payload=response.payload,
                         from_id=listener.name,
+                        to_id=to_id,
+                        thread_id=thread_id,
                     )
-
-                finally:
-                    if semaphore:
-                        semaphore.release()
-
-            except Exception as exc:
-                yield MessageState(
-                    raw_bytes=f"<huh>Handler {listener.name} crashed: {exc}</huh>".encode(),
-                    thread_id=state.thread_id,
+                # Legacy: raw bytes (backwards compatible)
+                elif isinstance(response, bytes):
+                    response_bytes = response
+                    thread_id = state.thread_id
+                else:
+                    response_bytes = b"<huh>Handler returned invalid type</huh>"
+                    thread_id = state.thread_id
+
+                # Response — will be processed by next iteration
+                return MessageState(
+                    raw_bytes=response_bytes,
+                    thread_id=thread_id,
                     from_id=listener.name,
-                    error=str(exc),
                 )
 
+            finally:
+                if semaphore:
+                    semaphore.release()
+
+        except Exception as exc:
+            return MessageState(
+                raw_bytes=f"<huh>Handler {listener.name} crashed: {exc}</huh>".encode(),
+                thread_id=state.thread_id,
+                from_id=listener.name,
+                error=str(exc),
+            )
+
     def _wrap_in_envelope(self, payload: Any, from_id: str, to_id: str, thread_id: str) -> bytes:
-        """Wrap a dataclass payload in a message envelope."""
-        # Serialize payload to XML
+        """
+        Wrap a dataclass payload in a message envelope.
+
+        Output is compact UTF-8 bytes (the repair parser drops blank text
+        anyway); construct the pump with pretty=True for readable envelopes
+        while debugging.
+        """
+        # Serialize payload to XML bytes
         if hasattr(payload, 'to_xml'):
             # SystemError and similar have manual to_xml()
-            payload_str = payload.to_xml()
+            payload_bytes = payload.to_xml().encode('utf-8')
         elif hasattr(payload, 'xml_value'):
             # @xmlify dataclasses
             payload_class_name = type(payload).__name__
             payload_tree = payload.xml_value(payload_class_name)
-            payload_str = etree.tostring(payload_tree, encoding='unicode')
+            payload_bytes = etree.tostring(payload_tree, encoding='utf-8', pretty_print=self.pretty)
         else:
             # Fallback for non-xmlify classes
             payload_class_name = type(payload).__name__
-            payload_str = f"<{payload_class_name}>{payload}</{payload_class_name}>"
+            payload_bytes = f"<{payload_class_name}>{payload}</{payload_class_name}>".encode('utf-8')
 
         # Add xmlns="" to keep payload out of envelope namespace
-        if 'xmlns=' not in payload_str:
-            idx = payload_str.index('>')
-            payload_str = payload_str[:idx] + ' xmlns=""' + payload_str[idx:]
-
-        envelope = f"""<message xmlns="https://xml-pipeline.org/ns/envelope/v1">
+        if b'xmlns=' not in payload_bytes:
+            idx = payload_bytes.index(b'>')
+            if payload_bytes[idx - 1:idx] == b'/':
+                idx -= 1
+            payload_bytes = payload_bytes[:idx] + b' xmlns=""' + payload_bytes[idx:]
+
+        if self.pretty:
+            head = f"""<message xmlns="{ENVELOPE_NS}">
   <meta>
     <from>{from_id}</from>
     <to>{to_id}</to>
     <thread>{thread_id}</thread>
   </meta>
-  {payload_str}
-</message>"""
-        return envelope.encode('utf-8')
+  """
+            return head.encode('utf-8') + payload_bytes.rstrip() + b"\n</message>"
+
+        head = f"{_ENVELOPE_OPEN}{from_id}</from><to>{to_id}</to><thread>{thread_id}</thread></meta>"
+        return b"".join((head.encode(), payload_bytes, b"</message>"))
 
     async def _reinject_responses(self, state: MessageState) -> None:
         """Push handler responses back into the queue for next iteration."""
@@ -575,11 +715,8 @@ class StreamPump:
             # ============================================================
             # STAGE 1: Envelope Processing (1:1 transforms)
             # ============================================================
-            | pipe.map(repair_step)
-            | pipe.map(c14n_step)
-            | pipe.map(envelope_validation_step)
-            | pipe.map(payload_extraction_step)
-            | pipe.map(thread_assignment_step)
+            # repair → c14n → envelope.xsd → payload extraction → thread assignment
+            | pipe.map(prepare_envelope_step)
 
             # ============================================================
             # STAGE 2: Fan-out — Extract Multiple Payloads (1:N)
@@ -589,26 +726,21 @@ class StreamPump:
             | pipe.flatmap(extract_payloads)
 
             # ============================================================
-            # STAGE 3: Per-Payload Validation (1:1 transforms)
+            # STAGE 3: Per-Payload Validation + Routing (1:1 transforms)
             # ============================================================
             # Note: In a real implementation, you'd route to listener-specific
             # validation here. For now, we use a simplified approach.
-            | pipe.map(self._validate_and_deserialize)
+            | pipe.map(self._validate_and_route)
 
             # ============================================================
-            # STAGE 4: Routing (1:1)
-            # ============================================================
-            | pipe.map(self._route_step)
-
-            # ============================================================
-            # STAGE 5: Filter Errors
+            # STAGE 4: Filter Errors
             # ============================================================
             # Errors go to a separate handler (could also be a branch)
             | pipe.map(self._handle_errors)
             | pipe.filter(lambda s: s.error is None and s.target_listeners)
 
             # ============================================================
-            # STAGE 6: Fan-out — Dispatch to Handlers (1:N for broadcast)
+            # STAGE 5: Fan-out — Dispatch to Handlers (1:N for broadcast)
             # ============================================================
             # This is where handlers are invoked. Broadcast = multiple yields.
             # task_limit controls concurrent handler invocations.
@@ -618,7 +750,7 @@ class StreamPump:
             )
 
             # ============================================================
-            # STAGE 7: Re-inject Responses
+            # STAGE 6: Re-inject Responses
             # ============================================================
             # Handler responses go back into the queue for next iteration.
             # The cycle continues until no more messages.
@@ -627,6 +759,10 @@ class StreamPump:
 
         return pipeline
 
+    async def _validate_and_route(self, state: MessageState) -> MessageState:
+        """Validation/deserialization and routing as one stream operator; neither suspends."""
+        return await self._route_step(await self._validate_and_deserialize(state))
+
     async def _validate_and_deserialize(self, state: MessageState) -> MessageState:
         """
         Combined validation + deserialization.
@@ -637,19 +773,19 @@ class StreamPump:
             return state
 
         # Build lookup key: to_id.payload_tag (matching routing table format)
-        payload_tag = state.payload_tree.tag
-        if payload_tag.startswith("{"):
-            payload_tag = payload_tag.split("}", 1)[1]
+        # (payload tags come from a small vocabulary, so the split is cached)
+        payload_tag = _routing_tag(state.payload_tree.tag)
 
         to_id = (state.to_id or "").lower()
-        lookup_key = f"{to_id}.{payload_tag.lower()}" if to_id else payload_tag.lower()
+        lookup_key = f"{to_id}.{payload_tag}" if to_id else payload_tag
 
-        listeners = self.routing_table.get(lookup_key, [])
+        listeners = self.routing_table.get(lookup_key, ())
         if not listeners:
             state.error = f"No listener for: {lookup_key}"
             return state
 
         listener = listeners[0]
+        state.target_listeners = listeners
 
         # Validate against listener's schema
         try:
@@ -660,8 +796,7 @@ class StreamPump:
 
         # Deserialize
         try:
-            from third_party.xmlable import parse_element
-            state.payload = parse_element(listener.payload_class, state.payload_tree)
+            state.payload = listener.deserialize(state.payload_tree)
         except Exception as e:
             state.error = f"Deserialization failed: {e}"
 
@@ -670,10 +805,54 @@ class StreamPump:
     async def _handle_errors(self, state: MessageState) -> MessageState:
         """Log errors (could also emit <huh> messages)."""
         if state.error:
-            print(f"[ERROR] {state.thread_id}: {state.error}")
+            if self._error_writer is None:
+                self._error_writer = asyncio.create_task(self._error_log_writer())
+            try:
+                self._error_log.put_nowait(f"[ERROR] {state.thread_id}: {state.error}\n")
+            except asyncio.QueueFull:
+                self.dropped_error_reports += 1
             # Could emit <huh> to a specific listener here
         return state
 
+    async def _error_log_writer(self) -> None:
+        """Drain queued error reports, one threaded write per batch."""
+        while True:
+            first = await self._error_log.get()
+            text = self._take_error_batch([first])
+            # Shielded so shutdown can cancel the writer yet still wait for
+            # this batch to land before flushing the rest
+            self._error_write = asyncio.ensure_future(asyncio.to_thread(sys.stdout.write, text))
+            await asyncio.shield(self._error_write)
+            self._error_write = None
+
+    def _take_error_batch(self, batch: List[str]) -> str:
+        """Join `batch`, anything else already queued and a drop summary."""
+        while not self._error_log.empty():
+            batch.append(self._error_log.get_nowait())
+        if self.dropped_error_reports > self._reported_drops:
+            batch.append(
+                f"[ERROR] {self.dropped_error_reports - self._reported_drops} "
+                f"error report(s) dropped\n"
+            )
+            self._reported_drops = self.dropped_error_reports
+        return "".join(batch)
+
+    async def _flush_error_log(self) -> None:
+        """Stop the writer task and write out every report still queued."""
+        if self._error_writer:
+            self._error_writer.cancel()
+            try:
+                await self._error_writer
+            except asyncio.CancelledError:
+                pass
+            self._error_writer = None
+        if self._error_write:
+            await self._error_write
+            self._error_write = None
+        text = self._take_error_batch([])
+        if text:
+            await asyncio.to_thread(sys.stdout.write, text)
+
     # ------------------------------------------------------------------
     # Run the Pump
     # ------------------------------------------------------------------
@@ -718,6 +897,9 @@ class StreamPump:
         self._running = False
         await self.queue.join()
 
+        # Flush remaining error reports and stop the writer
+        await self._flush_error_log()
+
 
 # ============================================================================
 # Config Loader (same as before)
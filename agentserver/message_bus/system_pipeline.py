@@ -21,7 +21,6 @@ Architecture:
 from __future__ import annotations
 
 import re
-import uuid
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -31,6 +30,7 @@ if TYPE_CHECKING:
     from .stream_pump import StreamPump
 
 from agentserver.primitives.text_input import TextInput, TextOutput
+from agentserver.utils.ids import uuid4_str
 
 logger = logging.getLogger(__name__)
 
@@ -258,7 +258,7 @@ class SystemPipeline:
 
     def _generate_thread_id(self) -> str:
         """Generate unique thread ID for external conversation."""
-        return str(uuid.uuid4())
+        return uuid4_str()
 
     def _wrap_envelope(
         self,
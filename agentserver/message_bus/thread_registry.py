@@ -16,11 +16,12 @@ Response routing:
   4. Updates/cleans up the registry
 """
 
-import uuid
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Tuple
 import threading
 
+from agentserver.utils.ids import uuid4_str
+
 
 @dataclass
 class ThreadRegistry:
@@ -57,7 +58,7 @@ class ThreadRegistry:
                 return self._root_uuid
 
             self._root_chain = f"system.{organism_name}"
-            self._root_uuid = str(uuid.uuid4())
+            self._root_uuid = uuid4_str()
             self._chain_to_uuid[self._root_chain] = self._root_uuid
             self._uuid_to_chain[self._root_uuid] = self._root_chain
             return self._root_uuid
@@ -86,7 +87,7 @@ class ThreadRegistry:
             if chain in self._chain_to_uuid:
                 return self._chain_to_uuid[chain]
 
-            new_uuid = str(uuid.uuid4())
+            new_uuid = uuid4_str()
             self._chain_to_uuid[chain] = new_uuid
             self._uuid_to_chain[new_uuid] = chain
             return new_uuid
@@ -127,7 +128,7 @@ class ThreadRegistry:
                 return self._chain_to_uuid[new_chain]
 
             # Create new UUID for extended chain
-            new_uuid = str(uuid.uuid4())
+            new_uuid = uuid4_str()
             self._chain_to_uuid[new_chain] = new_uuid
             self._uuid_to_chain[new_uuid] = new_chain
             return new_uuid
@@ -168,7 +169,7 @@ class ThreadRegistry:
             if pruned_chain in self._chain_to_uuid:
                 new_uuid = self._chain_to_uuid[pruned_chain]
             else:
-                new_uuid = str(uuid.uuid4())
+                new_uuid = uuid4_str()
                 self._chain_to_uuid[pruned_chain] = new_uuid
                 self._uuid_to_chain[new_uuid] = pruned_chain
 
@@ -249,11 +250,14 @@ class ThreadRegistry:
 
 # Global registry instance
 _registry: Optional[ThreadRegistry] = None
+_registry_lock = threading.Lock()
 
 
 def get_registry() -> ThreadRegistry:
     """Get the global thread registry."""
     global _registry
     if _registry is None:
-        _registry = ThreadRegistry()
+        with _registry_lock:
+            if _registry is None:
+                _registry = ThreadRegistry()
     return _registry
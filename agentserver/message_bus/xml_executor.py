@@ -0,0 +1,52 @@
+"""
+xml_executor.py — Dedicated thread pool for CPU-bound lxml work.
+
+lxml releases the GIL while parsing, so large envelopes can be parsed on a
+worker thread without stalling the event loop (and every other message in
+flight). The pool is kept separate from the loop's default executor, which
+is shared with blocking console input and similar calls.
+
+lxml parser objects must not be shared between threads — anything run here
+should use a thread-local parser.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Payloads smaller than this are parsed inline — the thread hop costs more
+# than the parse itself for typical small envelopes.
+OFFLOAD_THRESHOLD = 8 * 1024  # bytes
+
+
+# ============================================================================
+# Singleton
+# ============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_xml_executor() -> ThreadPoolExecutor:
+    """Get the global lxml worker pool."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 4,
+                    thread_name_prefix="xml-worker",
+                )
+    return _executor
+
+
+async def run_xml(func: Callable[..., T], *args) -> T:
+    """Run a synchronous lxml function on the worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_xml_executor(), func, *args)
@@ -6,6 +6,6 @@ Provides:
 - WebSocket for console and GUI clients
 """
 
-from .app import create_app, run_server
+from .app import create_app, run_server, serve
 
-__all__ = ["create_app", "run_server"]
+__all__ = ["create_app", "run_server", "serve"]
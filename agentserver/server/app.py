@@ -10,20 +10,28 @@ Provides:
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import signal
+import weakref
+from collections import deque
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional, Callable
 
 try:
-    from aiohttp import web, WSMsgType
+    from aiohttp import web, WSMsgType, WSCloseCode
     AIOHTTP_AVAILABLE = True
 except ImportError:
     AIOHTTP_AVAILABLE = False
     web = None
     WSMsgType = None
+    WSCloseCode = None
 
 from ..auth.users import get_user_store, UserStore
 from ..auth.sessions import get_session_manager, SessionManager, Session
+from ..memory import get_context_buffer
+from ..tools import close_http_session
+from ..utils import framing
+from ..utils.eventloop import install_fast_event_loop
 
 if TYPE_CHECKING:
     from ..message_bus.stream_pump import StreamPump
@@ -31,22 +39,91 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+WS_HEARTBEAT = 30.0  # seconds between keepalive pings
+WS_MAX_MALFORMED = 20  # undecodable frames tolerated per window before closing
+WS_MALFORMED_WINDOW = 60.0  # seconds
+
+LOGIN_MAX_BODY = 4096  # bytes; a login body is a username and a password
+
+# Constant replies for the most frequent requests, encoded once
+_HEALTH_BODY = framing.encode_json({"status": "ok"})
+_INVALID_JSON_BODY = framing.encode_json({"error": "Invalid JSON"})
+_BAD_CREDENTIALS_BODY = framing.encode_json({"error": "Invalid credentials"})
+_MISSING_AUTH_BODY = framing.encode_json({"error": "Missing Authorization"})
+_INVALID_TOKEN_BODY = framing.encode_json({"error": "Invalid token"})
+
+# Routes served without a session
+_PUBLIC_PATHS = frozenset({"/auth/login", "/health"})
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedReply:
+    """
+    A WebSocket reply encoded once, for replies handed out over and over.
+
+    handle_ws_msg may return one in place of a dict; handle_websocket sends
+    the stored frame for the connection's framing instead of re-encoding.
+    """
+    text: str
+    packed: Optional[bytes]  # None when msgpack is not installed
+
+    @classmethod
+    def of(cls, reply: dict) -> EncodedReply:
+        packed = framing.pack(reply) if framing.MSGPACK_AVAILABLE else None
+        return cls(framing.dumps_json(reply), packed)
+
+
+_PONG = EncodedReply.of({"type": "pong"})
+
+# pump → (pump.listeners_version, reply) for its last "listeners" request.
+# Weak, so the cache never keeps a pump alive.
+_listeners_replies: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Error replies are built around the message: only str(e) gets encoded. A
+# packed empty string is the single byte 0xa0, so dropping it leaves the
+# msgpack map header and keys with the value slot open.
+_ERROR_TEXT_PREFIX = framing.dumps_json({"type": "error", "error": ""})[:-3]
+_ERROR_PACKED_PREFIX = (
+    framing.pack({"type": "error", "error": ""})[:-1] if framing.MSGPACK_AVAILABLE else None
+)
+
+
+async def _send_error(ws, message: str, binary: bool) -> None:
+    if binary:
+        await ws.send_bytes(_ERROR_PACKED_PREFIX + framing.pack(message))
+    else:
+        await ws.send_str(_ERROR_TEXT_PREFIX + framing.dumps_json(message) + "}")
+
+
+def _json_response(data, status: int = 200):
+    """
+    web.json_response, encoded with framing's (orjson when available) encoder.
+
+    Goes straight to body bytes: json_response would build a str first and
+    then encode it again.
+    """
+    return _encoded_response(framing.encode_json(data), status=status)
+
+
+def _encoded_response(body: bytes, status: int = 200):
+    """JSON response from an already-encoded body."""
+    return web.Response(body=body, status=status, content_type="application/json", charset="utf-8")
+
 
 def auth_middleware():
     @web.middleware
     async def middleware(request, handler):
-        if request.path in ("/auth/login", "/health"):
+        if request.path in _PUBLIC_PATHS:
             return await handler(request)
 
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return web.json_response({"error": "Missing Authorization"}, status=401)
+        scheme, sep, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer" or not sep:
+            return _encoded_response(_MISSING_AUTH_BODY, status=401)
 
-        token = auth_header[7:]
         session = request.app["session_manager"].validate(token)
 
         if not session:
-            return web.json_response({"error": "Invalid token"}, status=401)
+            return _encoded_response(_INVALID_TOKEN_BODY, status=401)
 
         request["session"] = session
         return await handler(request)
@@ -55,34 +132,51 @@ def auth_middleware():
 
 
 async def handle_login(request):
+    # Credentials are tiny; refuse anything bigger before parsing it
+    if (request.content_length or 0) > LOGIN_MAX_BODY:
+        return web.Response(status=413)
+    raw = await request.read()
+    if len(raw) > LOGIN_MAX_BODY:
+        return web.Response(status=413)
+
     try:
-        data = await request.json()
-    except:
-        return web.json_response({"error": "Invalid JSON"}, status=400)
+        data = framing.loads_json(raw)
+    except ValueError:  # JSONDecodeError (either backend), UnicodeDecodeError
+        return _encoded_response(_INVALID_JSON_BODY, status=400)
+    if not isinstance(data, dict):
+        return _encoded_response(_INVALID_JSON_BODY, status=400)
 
     username = data.get("username", "")
     password = data.get("password", "")
 
     if not username or not password:
-        return web.json_response({"error": "Credentials required"}, status=400)
+        return _json_response({"error": "Credentials required"}, status=400)
 
     user = request.app["user_store"].authenticate(username, password)
     if not user:
-        return web.json_response({"error": "Invalid credentials"}, status=401)
+        return _encoded_response(_BAD_CREDENTIALS_BODY, status=401)
 
     session = request.app["session_manager"].create(user.username, user.role)
-    return web.json_response(session.to_dict())
+    return _json_response(session.to_dict())
+
+
+async def handle_refresh(request):
+    session = request["session"]
+    new_session = request.app["session_manager"].refresh(session.token)
+    if not new_session:
+        return _encoded_response(_INVALID_TOKEN_BODY, status=401)
+    return _json_response(new_session.to_dict())
 
 
 async def handle_logout(request):
     session = request["session"]
     request.app["session_manager"].revoke(session.token)
-    return web.json_response({"message": "Logged out"})
+    return _json_response({"message": "Logged out"})
 
 
 async def handle_me(request):
     session = request["session"]
-    return web.json_response({
+    return _json_response({
         "username": session.username,
         "role": session.role,
         "expires_at": session.expires_at.isoformat(),
@@ -90,7 +184,7 @@ async def handle_me(request):
 
 
 async def handle_health(request):
-    return web.json_response({"status": "ok"})
+    return _encoded_response(_HEALTH_BODY)
 
 
 async def handle_websocket(request):
@@ -98,32 +192,70 @@ async def handle_websocket(request):
     pump = request.app.get("pump")
     system_pipeline = request.app.get("system_pipeline")
 
-    ws = web.WebSocketResponse()
+    # Offer binary framing; clients that don't ask for it stay on JSON.
+    # No per-message deflate: console frames are too small to benefit.
+    ws = web.WebSocketResponse(
+        protocols=framing.SUPPORTED_PROTOCOLS,
+        compress=False,
+        heartbeat=WS_HEARTBEAT,
+    )
     await ws.prepare(request)
 
     # Track this WebSocket for response delivery
     ws_id = id(ws)
-    request.app["websockets"][ws_id] = {
+    ws_state = request.app["websockets"][ws_id] = {
         "ws": ws,
         "user": session.username,
         "threads": set(),  # Thread IDs this client is subscribed to
     }
 
-    await ws.send_json({"type": "connected", "username": session.username})
+    await ws.send_json(
+        {"type": "connected", "username": session.username}, dumps=framing.dumps_json
+    )
 
+    # Arrival times of the last WS_MAX_MALFORMED bad frames
+    malformed = deque(maxlen=WS_MAX_MALFORMED)
+    loop = asyncio.get_running_loop()
     try:
         async for msg in ws:
             if msg.type == WSMsgType.TEXT:
-                try:
-                    data = json.loads(msg.data)
-                    resp = await handle_ws_msg(
-                        data, session, pump, system_pipeline,
-                        request.app["websockets"][ws_id]
-                    )
-                    await ws.send_json(resp)
-                except Exception as e:
-                    logger.exception(f"WebSocket error: {e}")
-                    await ws.send_json({"type": "error", "error": str(e)})
+                binary = False
+            elif msg.type == WSMsgType.BINARY:
+                binary = ws.ws_protocol == framing.MSGPACK_PROTOCOL
+            else:
+                continue
+
+            try:
+                if msg.type == WSMsgType.BINARY and not binary:
+                    raise ValueError(f"Binary frames need the {framing.MSGPACK_PROTOCOL} subprotocol")
+                data = framing.unpack(msg.data) if binary else framing.loads_json(msg.data)
+                if not isinstance(data, dict):
+                    raise ValueError("Expected an object")
+            except Exception as e:
+                # A client sending garbage gets replies, until it sends
+                # WS_MAX_MALFORMED bad frames within WS_MALFORMED_WINDOW
+                now = loop.time()
+                malformed.append(now)
+                if len(malformed) == WS_MAX_MALFORMED and now - malformed[0] <= WS_MALFORMED_WINDOW:
+                    logger.warning(f"Closing WebSocket for {session.username}: too many malformed frames")
+                    await ws.close(code=WSCloseCode.POLICY_VIOLATION, message=b"Too many malformed frames")
+                    break
+                await _send_error(ws, f"Malformed frame: {str(e) or type(e).__name__}", binary)
+                continue
+
+            try:
+                resp = await handle_ws_msg(data, session, pump, system_pipeline, ws_state)
+            except Exception as e:
+                logger.exception(f"WebSocket error: {e}")
+                await _send_error(ws, str(e), binary)
+                continue
+
+            # Reply in the same framing the command arrived in
+            encoded = isinstance(resp, EncodedReply)
+            if binary:
+                await ws.send_bytes(resp.packed if encoded else framing.pack(resp))
+            else:
+                await ws.send_str(resp.text if encoded else framing.dumps_json(resp))
     finally:
         # Cleanup on disconnect
         del request.app["websockets"][ws_id]
@@ -131,6 +263,17 @@ async def handle_websocket(request):
     return ws
 
 
+def _listeners_snapshot(pump) -> EncodedReply:
+    """The "listeners" reply, re-encoded only when the pump's listener set changes."""
+    cached = _listeners_replies.get(pump)
+    if cached is not None and cached[0] == pump.listeners_version:
+        return cached[1]
+
+    reply = EncodedReply.of({"type": "listeners", "listeners": list(pump.listeners)})
+    _listeners_replies[pump] = (pump.listeners_version, reply)
+    return reply
+
+
 async def handle_ws_msg(data, session, pump, system_pipeline, ws_state):
     """
     Handle WebSocket message.
@@ -145,17 +288,16 @@ async def handle_ws_msg(data, session, pump, system_pipeline, ws_state):
     t = data.get("type", "")
 
     if t == "ping":
-        return {"type": "pong"}
+        return _PONG
 
     elif t == "status":
-        from ..memory import get_context_buffer
         stats = get_context_buffer().get_stats()
         return {"type": "status", "threads": stats["thread_count"]}
 
     elif t == "listeners" or t == "targets":
         if not pump:
             return {"type": "listeners", "listeners": []}
-        return {"type": "listeners", "listeners": list(pump.listeners.keys())}
+        return _listeners_snapshot(pump)
 
     elif t == "send":
         # Send message to pipeline
@@ -230,7 +372,11 @@ def create_app(pump=None, system_pipeline=None):
 
     app["system_pipeline"] = system_pipeline
 
+    # HTTP-backed tools share one client session; close it with the app
+    app.on_cleanup.append(lambda app: close_http_session())
+
     app.router.add_post("/auth/login", handle_login)
+    app.router.add_post("/auth/refresh", handle_refresh)
     app.router.add_post("/auth/logout", handle_logout)
     app.router.add_get("/auth/me", handle_me)
     app.router.add_get("/health", handle_health)
@@ -239,15 +385,41 @@ def create_app(pump=None, system_pipeline=None):
     return app
 
 
-async def run_server(pump=None, host="127.0.0.1", port=8765):
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def _add_stop_handlers(stop: asyncio.Event) -> list:
+    """Set stop on SIGINT/SIGTERM where the loop supports it. Returns the signals hooked."""
+    loop = asyncio.get_running_loop()
+    hooked = []
+    for sig in _STOP_SIGNALS:
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows loops, or not running in the main thread
+            continue
+        hooked.append(sig)
+    return hooked
+
+
+async def run_server(pump=None, host="127.0.0.1", port=8765, stop: Optional[asyncio.Event] = None):
     """
-    Run the server.
+    Run the server until stopped.
+
+    Runs on whatever loop is current; use serve() to get uvloop/winloop.
 
     Args:
         pump: StreamPump instance for message handling
         host: Bind address
         port: Port number
+        stop: Event that shuts the server down when set. If omitted, one is
+              created and set by SIGINT/SIGTERM.
     """
+    hooked = []
+    if stop is None:
+        stop = asyncio.Event()
+        hooked = _add_stop_handlers(stop)
+
     app = create_app(pump)
     runner = web.AppRunner(app)
     await runner.setup()
@@ -258,9 +430,24 @@ async def run_server(pump=None, host="127.0.0.1", port=8765):
     print(f"Server on http://{host}:{port}")
 
     try:
-        while True:
-            await asyncio.sleep(3600)
+        await stop.wait()
     except asyncio.CancelledError:
         pass
     finally:
+        loop = asyncio.get_running_loop()
+        for sig in hooked:
+            loop.remove_signal_handler(sig)
         await runner.cleanup()
+
+
+def serve(pump=None, host="127.0.0.1", port=8765):
+    """
+    Blocking entry point: run_server() on uvloop/winloop when installed.
+
+    Under gunicorn, use aiohttp.GunicornUVLoopWebWorker with create_app instead.
+    """
+    install_fast_event_loop()
+    try:
+        asyncio.run(run_server(pump, host, port))
+    except KeyboardInterrupt:
+        pass
@@ -6,6 +6,7 @@ to interact with the outside world.
 """
 
 from .base import Tool, ToolResult, tool, get_tool_registry
+from ._http import close_session as close_http_session
 from .calculate import calculate
 from .fetch import fetch_url
 from .files import read_file, write_file, list_dir, delete_file, configure_allowed_paths
@@ -21,6 +22,8 @@ __all__ = [
     "ToolResult",
     "tool",
     "get_tool_registry",
+    # Lifecycle
+    "close_http_session",
     # Configuration
     "configure_allowed_paths",
     "configure_allowed_commands",
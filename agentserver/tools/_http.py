@@ -0,0 +1,61 @@
+"""
+Shared aiohttp client session for the HTTP-backed tools.
+
+A ClientSession owns a connection pool, DNS cache and SSL context; creating
+one per call throws all of that away. fetch, search and librarian share one
+session per event loop instead, so keep-alive connections and resolved
+hosts carry over between calls.
+
+Cookies are not kept: tool calls stay independent of each other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+# Connection pool tuning
+CONNECTION_LIMIT = 100
+DNS_CACHE_TTL = 300       # seconds
+KEEPALIVE_TIMEOUT = 30    # seconds
+
+_session: Optional["aiohttp.ClientSession"] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_session() -> "aiohttp.ClientSession":
+    """
+    Return the shared session, creating it on first use.
+
+    Must be called from a coroutine. A session only works on the loop that
+    created it, so a new one is made if the running loop has changed.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session (e.g. on server shutdown). Safe to call twice."""
+    global _session, _session_loop
+    session, _session, _session_loop = _session, None, None
+    if session is not None and not session.closed:
+        await session.close()
@@ -10,9 +10,14 @@ from functools import wraps
 import inspect
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
-    """Result from a tool invocation."""
+    """
+    Result from a tool invocation.
+
+    Treat as read-only: tools may hand back one shared instance for a
+    constant failure (e.g. a missing optional dependency).
+    """
     success: bool
     data: Any = None
     error: Optional[str] = None
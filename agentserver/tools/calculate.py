@@ -8,6 +8,7 @@ No external dependencies required.
 from __future__ import annotations
 
 import ast
+import functools
 import math
 import operator
 from typing import Any, Union
@@ -71,11 +72,15 @@ MATH_CONSTANTS = {
 class SafeEvaluator(ast.NodeVisitor):
     """Safely evaluate mathematical expressions using AST."""
 
+    # Node class name → visit_* function, filled in below the class
+    _visitors: dict[str, Any] = {}
+
     def visit(self, node: ast.AST) -> Any:
         """Visit a node."""
-        method = f"visit_{node.__class__.__name__}"
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        visitor = self._visitors.get(node.__class__.__name__)
+        if visitor is None:
+            return self.generic_visit(node)
+        return visitor(self, node)
 
     def generic_visit(self, node: ast.AST) -> None:
         """Reject unknown node types."""
@@ -142,14 +147,29 @@ class SafeEvaluator(ast.NodeVisitor):
         return self.visit(node.orelse)
 
 
+SafeEvaluator._visitors = {
+    name[len("visit_"):]: fn
+    for name, fn in vars(SafeEvaluator).items()
+    if name.startswith("visit_")
+}
+
+# Stateless, so one instance serves every call
+_evaluator = SafeEvaluator()
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse(expression: str) -> ast.Expression:
+    """Parse once per distinct expression; the evaluator never mutates trees."""
+    return ast.parse(expression, mode="eval")
+
+
 def safe_eval(expression: str) -> Any:
     """Safely evaluate a mathematical expression."""
     try:
-        tree = ast.parse(expression, mode="eval")
+        tree = _parse(expression)
     except SyntaxError as e:
         raise ValueError(f"Invalid syntax: {e}")
-    evaluator = SafeEvaluator()
-    return evaluator.visit(tree)
+    return _evaluator.visit(tree)
 
 
 @tool
@@ -12,6 +12,7 @@ from typing import Optional, Dict
 from urllib.parse import urlparse
 
 from .base import tool, ToolResult
+from ._http import get_session
 
 # Try to import aiohttp - optional dependency
 try:
@@ -20,6 +21,12 @@ try:
 except ImportError:
     AIOHTTP_AVAILABLE = False
 
+# Constant failures, shared rather than rebuilt per call
+_NO_AIOHTTP = ToolResult(
+    success=False,
+    error="aiohttp not installed. Install with: pip install xml-pipeline[server]",
+)
+
 
 # Security configuration
 MAX_RESPONSE_SIZE = 10 * 1024 * 1024  # 10 MB
@@ -108,10 +115,7 @@ async def fetch_url(
         - Timeout enforced
     """
     if not AIOHTTP_AVAILABLE:
-        return ToolResult(
-            success=False,
-            error="aiohttp not installed. Install with: pip install xml-pipeline[server]"
-        )
+        return _NO_AIOHTTP
 
     # Validate URL
     if error := _validate_url(url, allow_internal):
@@ -128,43 +132,43 @@ async def fetch_url(
 
     try:
         client_timeout = aiohttp.ClientTimeout(total=timeout)
-        async with aiohttp.ClientSession(timeout=client_timeout) as session:
-            async with session.request(
-                method,
-                url,
-                headers=headers,
-                data=body,
-            ) as resp:
-                # Check response size before reading
-                content_length = resp.headers.get("Content-Length")
-                if content_length and int(content_length) > MAX_RESPONSE_SIZE:
-                    return ToolResult(
-                        success=False,
-                        error=f"Response too large: {content_length} bytes (max: {MAX_RESPONSE_SIZE})"
-                    )
-
-                # Read response with size limit
-                body_bytes = await resp.content.read(MAX_RESPONSE_SIZE + 1)
-                if len(body_bytes) > MAX_RESPONSE_SIZE:
-                    return ToolResult(
-                        success=False,
-                        error=f"Response exceeded {MAX_RESPONSE_SIZE} bytes"
-                    )
-
-                # Try to decode as text
-                try:
-                    body_text = body_bytes.decode("utf-8")
-                except UnicodeDecodeError:
-                    # Return base64 for binary content
-                    import base64
-                    body_text = base64.b64encode(body_bytes).decode("ascii")
-
-                return ToolResult(success=True, data={
-                    "status_code": resp.status,
-                    "headers": dict(resp.headers),
-                    "body": body_text,
-                    "url": str(resp.url),  # Final URL after redirects
-                })
+        async with get_session().request(
+            method,
+            url,
+            headers=headers,
+            data=body,
+            timeout=client_timeout,
+        ) as resp:
+            # Check response size before reading
+            content_length = resp.headers.get("Content-Length")
+            if content_length and int(content_length) > MAX_RESPONSE_SIZE:
+                return ToolResult(
+                    success=False,
+                    error=f"Response too large: {content_length} bytes (max: {MAX_RESPONSE_SIZE})"
+                )
+
+            # Read response with size limit
+            body_bytes = await resp.content.read(MAX_RESPONSE_SIZE + 1)
+            if len(body_bytes) > MAX_RESPONSE_SIZE:
+                return ToolResult(
+                    success=False,
+                    error=f"Response exceeded {MAX_RESPONSE_SIZE} bytes"
+                )
+
+            # Try to decode as text
+            try:
+                body_text = body_bytes.decode("utf-8")
+            except UnicodeDecodeError:
+                # Return base64 for binary content
+                import base64
+                body_text = base64.b64encode(body_bytes).decode("ascii")
+
+            return ToolResult(success=True, data={
+                "status_code": resp.status,
+                "headers": dict(resp.headers),
+                "body": body_text,
+                "url": str(resp.url),  # Final URL after redirects
+            })
 
     except aiohttp.ClientError as e:
         return ToolResult(success=False, error=f"HTTP error: {e}")
@@ -6,9 +6,13 @@ All paths are validated against configured allowed directories.
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import fnmatch
+import os
+import re
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Iterator, Optional, List
 
 from .base import tool, ToolResult
 
@@ -45,6 +49,66 @@ def _validate_path(path: str) -> tuple[Optional[str], Optional[Path]]:
     return "Path not in allowed directories", None
 
 
+def _scan(root: str, prefix: str, match: Callable, recursive: bool) -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield (relative name, DirEntry) for entries under root whose name matches.
+
+    Same order as Path.glob/rglob (each directory's matches, then its
+    subdirectories depth-first, not following symlinks), but with one
+    scandir per directory and DirEntry's cached file type.
+    """
+    subdirs = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if match(entry.name):
+                yield os.path.join(prefix, entry.name), entry
+            if recursive and entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry)
+    for entry in subdirs:
+        try:
+            yield from _scan(entry.path, os.path.join(prefix, entry.name), match, recursive)
+        except OSError:
+            continue  # Unreadable subdirectory — rglob skips these too
+
+
+def _read_sync(resolved: Path, encoding: str, binary: bool, offset: int, read_size: int) -> dict:
+    """Blocking body of read_file — runs on a worker thread."""
+    file_size = resolved.stat().st_size
+    if binary:
+        with open(resolved, "rb") as f:
+            if offset:
+                f.seek(offset)
+            content = f.read(read_size)
+        return {
+            "content": base64.b64encode(content).decode("ascii"),
+            "size": file_size,
+            "encoding": "base64",
+        }
+    with open(resolved, "r", encoding=encoding) as f:
+        if offset:
+            f.seek(offset)
+        content = f.read(read_size)
+    return {
+        "content": content,
+        "size": file_size,
+        "encoding": encoding,
+    }
+
+
+def _write_sync(
+    resolved: Path, data: bytes | str, append: bool, encoding: str, create_dirs: bool
+) -> None:
+    """Blocking body of write_file — runs on a worker thread. str is written in text mode."""
+    if create_dirs:
+        resolved.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        with open(resolved, "a" if append else "w", encoding=encoding) as f:
+            f.write(data)
+    else:
+        with open(resolved, "ab" if append else "wb") as f:
+            f.write(data)
+
+
 @tool
 async def read_file(
     path: str,
@@ -61,28 +125,10 @@ async def read_file(
     if not resolved.is_file():
         return ToolResult(success=False, error=f"Not a file: {path}")
     try:
-        file_size = resolved.stat().st_size
         read_size = min(limit or MAX_FILE_SIZE, MAX_FILE_SIZE)
-        if binary:
-            with open(resolved, "rb") as f:
-                if offset:
-                    f.seek(offset)
-                content = f.read(read_size)
-            return ToolResult(success=True, data={
-                "content": base64.b64encode(content).decode("ascii"),
-                "size": file_size,
-                "encoding": "base64",
-            })
-        else:
-            with open(resolved, "r", encoding=encoding) as f:
-                if offset:
-                    f.seek(offset)
-                content = f.read(read_size)
-            return ToolResult(success=True, data={
-                "content": content,
-                "size": file_size,
-                "encoding": encoding,
-            })
+        # Disk I/O runs on a worker thread so it never stalls the event loop
+        data = await asyncio.to_thread(_read_sync, resolved, encoding, binary, offset, read_size)
+        return ToolResult(success=True, data=data)
     except UnicodeDecodeError:
         return ToolResult(success=False, error=f"Cannot decode as {encoding}. Try binary=true.")
     except Exception as e:
@@ -111,18 +157,9 @@ async def write_file(
     if len(data) > MAX_FILE_SIZE:
         return ToolResult(success=False, error=f"Content too large: {len(data)} bytes")
     try:
-        if create_dirs:
-            resolved.parent.mkdir(parents=True, exist_ok=True)
-        if binary:
-            write_mode = "ab" if mode == "append" else "wb"
-            with open(resolved, write_mode) as f:
-                f.write(data)
-        else:
-            if mode == "append":
-                with open(resolved, "a", encoding=encoding) as f:
-                    f.write(content)
-            else:
-                resolved.write_text(content, encoding=encoding)
+        await asyncio.to_thread(
+            _write_sync, resolved, data if binary else content, mode == "append", encoding, create_dirs,
+        )
         return ToolResult(success=True, data={"bytes_written": len(data), "path": str(resolved)})
     except Exception as e:
         return ToolResult(success=False, error=f"Write error: {e}")
@@ -144,14 +181,25 @@ async def list_dir(
         return ToolResult(success=False, error=f"Not a directory: {path}")
     try:
         entries = []
-        glob_method = resolved.rglob if recursive else resolved.glob
-        for entry in glob_method(pattern):
+        if "/" in pattern or os.sep in pattern or "**" in pattern:
+            # Multi-segment patterns need pathlib's glob
+            glob_method = resolved.rglob if recursive else resolved.glob
+            found = (
+                (str(p.relative_to(resolved)), p) for p in glob_method(pattern)
+            )
+        else:
+            flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+            match = re.compile(fnmatch.translate(pattern), flags).fullmatch
+            found = _scan(str(resolved), "", match, recursive)
+        for name, entry in found:
             if not include_hidden and entry.name.startswith("."):
                 continue
             try:
+                # DirEntry answers is_dir() from the directory listing;
+                # stat() is the only syscall left per entry
                 stat = entry.stat()
                 entries.append({
-                    "name": str(entry.relative_to(resolved)),
+                    "name": name,
                     "type": "dir" if entry.is_dir() else "file",
                     "size": stat.st_size if entry.is_file() else None,
                     "modified": stat.st_mtime,
@@ -11,14 +11,18 @@ from typing import Optional, List
 from dataclasses import dataclass
 
 from .base import tool, ToolResult
+from ._http import AIOHTTP_AVAILABLE, get_session
 
 
-# Try to import aiohttp for HTTP requests
-try:
-    import aiohttp
-    AIOHTTP_AVAILABLE = True
-except ImportError:
-    AIOHTTP_AVAILABLE = False
+# Constant failures, shared rather than rebuilt per call
+_NO_AIOHTTP = ToolResult(
+    success=False,
+    error="aiohttp not installed. Install with: pip install xml-pipeline[server]",
+)
+_NOT_CONFIGURED = ToolResult(
+    success=False,
+    error="Search not configured. Call configure_search() first.",
+)
 
 
 @dataclass
@@ -59,28 +63,28 @@ def configure_search(
 
 async def _search_serpapi(query: str, num_results: int) -> List[dict]:
     """Search using SerpAPI."""
-    async with aiohttp.ClientSession() as session:
-        params = {
-            "q": query,
-            "api_key": _config.api_key,
-            "num": num_results,
-            "engine": "google",
-        }
-        async with session.get(
-            "https://serpapi.com/search",
-            params=params,
-        ) as resp:
-            if resp.status != 200:
-                raise Exception(f"SerpAPI error: {resp.status}")
-            data = await resp.json()
-            results = []
-            for item in data.get("organic_results", [])[:num_results]:
-                results.append({
-                    "title": item.get("title", ""),
-                    "url": item.get("link", ""),
-                    "snippet": item.get("snippet", ""),
-                })
-            return results
+    session = get_session()
+    params = {
+        "q": query,
+        "api_key": _config.api_key,
+        "num": num_results,
+        "engine": "google",
+    }
+    async with session.get(
+        "https://serpapi.com/search",
+        params=params,
+    ) as resp:
+        if resp.status != 200:
+            raise Exception(f"SerpAPI error: {resp.status}")
+        data = await resp.json()
+        results = []
+        for item in data.get("organic_results", [])[:num_results]:
+            results.append({
+                "title": item.get("title", ""),
+                "url": item.get("link", ""),
+                "snippet": item.get("snippet", ""),
+            })
+        return results
 
 
 async def _search_google(query: str, num_results: int) -> List[dict]:
@@ -88,54 +92,54 @@ async def _search_google(query: str, num_results: int) -> List[dict]:
     if not _config.engine_id:
         raise Exception("Google Custom Search requires engine_id")
     
-    async with aiohttp.ClientSession() as session:
-        params = {
-            "q": query,
-            "key": _config.api_key,
-            "cx": _config.engine_id,
-            "num": min(num_results, 10),  # API max is 10
-        }
-        async with session.get(
-            "https://www.googleapis.com/customsearch/v1",
-            params=params,
-        ) as resp:
-            if resp.status != 200:
-                raise Exception(f"Google API error: {resp.status}")
-            data = await resp.json()
-            results = []
-            for item in data.get("items", []):
-                results.append({
-                    "title": item.get("title", ""),
-                    "url": item.get("link", ""),
-                    "snippet": item.get("snippet", ""),
-                })
-            return results
+    session = get_session()
+    params = {
+        "q": query,
+        "key": _config.api_key,
+        "cx": _config.engine_id,
+        "num": min(num_results, 10),  # API max is 10
+    }
+    async with session.get(
+        "https://www.googleapis.com/customsearch/v1",
+        params=params,
+    ) as resp:
+        if resp.status != 200:
+            raise Exception(f"Google API error: {resp.status}")
+        data = await resp.json()
+        results = []
+        for item in data.get("items", []):
+            results.append({
+                "title": item.get("title", ""),
+                "url": item.get("link", ""),
+                "snippet": item.get("snippet", ""),
+            })
+        return results
 
 
 async def _search_bing(query: str, num_results: int) -> List[dict]:
     """Search using Bing Search API."""
-    async with aiohttp.ClientSession() as session:
-        headers = {"Ocp-Apim-Subscription-Key": _config.api_key}
-        params = {
-            "q": query,
-            "count": num_results,
-        }
-        async with session.get(
-            "https://api.bing.microsoft.com/v7.0/search",
-            headers=headers,
-            params=params,
-        ) as resp:
-            if resp.status != 200:
-                raise Exception(f"Bing API error: {resp.status}")
-            data = await resp.json()
-            results = []
-            for item in data.get("webPages", {}).get("value", []):
-                results.append({
-                    "title": item.get("name", ""),
-                    "url": item.get("url", ""),
-                    "snippet": item.get("snippet", ""),
-                })
-            return results
+    session = get_session()
+    headers = {"Ocp-Apim-Subscription-Key": _config.api_key}
+    params = {
+        "q": query,
+        "count": num_results,
+    }
+    async with session.get(
+        "https://api.bing.microsoft.com/v7.0/search",
+        headers=headers,
+        params=params,
+    ) as resp:
+        if resp.status != 200:
+            raise Exception(f"Bing API error: {resp.status}")
+        data = await resp.json()
+        results = []
+        for item in data.get("webPages", {}).get("value", []):
+            results.append({
+                "title": item.get("name", ""),
+                "url": item.get("url", ""),
+                "snippet": item.get("snippet", ""),
+            })
+        return results
 
 
 @tool
@@ -160,16 +164,10 @@ async def web_search(
         configure_search("serpapi", "your-api-key")
     """
     if not AIOHTTP_AVAILABLE:
-        return ToolResult(
-            success=False,
-            error="aiohttp not installed. Install with: pip install xml-pipeline[server]"
-        )
+        return _NO_AIOHTTP
     
     if not _config:
-        return ToolResult(
-            success=False,
-            error="Search not configured. Call configure_search() first."
-        )
+        return _NOT_CONFIGURED
     
     # Clamp num_results
     num_results = min(max(1, num_results), 20)
@@ -7,15 +7,17 @@ Provides controlled command execution with security restrictions.
 from __future__ import annotations
 
 import asyncio
+import re
 import shlex
-from typing import Optional, List
+from typing import FrozenSet, Iterable, Optional
 
 from .base import tool, ToolResult
 
 
-# Security configuration
-ALLOWED_COMMANDS: List[str] = []  # Empty = check blocklist only
-BLOCKED_COMMANDS: List[str] = [
+# Security configuration. Frozensets, so the gate checks exactly what is
+# configured: replace them through configure_*(); they cannot be edited in place.
+ALLOWED_COMMANDS: FrozenSet[str] = frozenset()  # Empty = check blocklist only
+BLOCKED_COMMANDS: FrozenSet[str] = frozenset({
     # Destructive commands
     "rm", "rmdir", "del", "erase", "format", "mkfs", "dd",
     # System modification
@@ -26,22 +28,28 @@ BLOCKED_COMMANDS: List[str] = [
     "sudo", "su", "doas", "runas",
     # Shell escapes
     "bash", "sh", "zsh", "fish", "cmd", "powershell", "pwsh",
-]
+})
 DEFAULT_TIMEOUT = 30
 MAX_TIMEOUT = 300
 MAX_OUTPUT_SIZE = 1024 * 1024  # 1 MB
+READ_CHUNK = 64 * 1024
 
+# Shell operators that could chain or substitute commands. Longer operators
+# come first so "||" is reported as such rather than as "|".
+DANGEROUS_OPERATORS = (";", "&&", "||", "|", "`", "$(", "${")
+_OPERATOR_RE = re.compile("|".join(re.escape(op) for op in DANGEROUS_OPERATORS))
 
-def configure_allowed_commands(commands: List[str]) -> None:
+
+def configure_allowed_commands(commands: Iterable[str]) -> None:
     """Set an allowlist of commands (empty = blocklist mode)."""
     global ALLOWED_COMMANDS
-    ALLOWED_COMMANDS = commands
+    ALLOWED_COMMANDS = frozenset(commands)
 
 
-def configure_blocked_commands(commands: List[str]) -> None:
+def configure_blocked_commands(commands: Iterable[str]) -> None:
     """Set additional blocked commands."""
     global BLOCKED_COMMANDS
-    BLOCKED_COMMANDS = commands
+    BLOCKED_COMMANDS = frozenset(commands)
 
 
 def _validate_command(command: str) -> Optional[str]:
@@ -67,17 +75,34 @@ def _validate_command(command: str) -> Optional[str]:
         if executable in BLOCKED_COMMANDS:
             return f"Command '{executable}' is blocked for security"
         
-        # Check for shell operators that could be dangerous
-        dangerous_operators = [";", "&&", "||", "|", "`", "$(", "${"]
-        for op in dangerous_operators:
-            if op in command:
-                return f"Shell operator '{op}' not allowed"
+        # Check for shell operators that could be dangerous (one regex scan)
+        match = _OPERATOR_RE.search(command)
+        if match:
+            return f"Shell operator '{match.group()}' not allowed"
         
         return None
     except ValueError as e:
         return f"Invalid command syntax: {e}"
 
 
+async def _drain(reader: asyncio.StreamReader) -> tuple[bytes, bool]:
+    """
+    Read a pipe to EOF, keeping at most MAX_OUTPUT_SIZE bytes.
+
+    Output past the cap is read and dropped (so the process never blocks on
+    a full pipe) instead of being buffered. Returns (output, truncated).
+    """
+    buf = bytearray()
+    truncated = False
+    while chunk := await reader.read(READ_CHUNK):
+        room = MAX_OUTPUT_SIZE - len(buf)
+        if len(chunk) > room:
+            truncated = True
+            chunk = chunk[:room]
+        buf += chunk
+    return bytes(buf), truncated
+
+
 @tool
 async def run_command(
     command: str,
@@ -128,8 +153,9 @@ async def run_command(
         
         timed_out = False
         try:
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(),
+            # Both pipes drain concurrently with bounded buffers
+            (stdout, out_truncated), (stderr, err_truncated), _ = await asyncio.wait_for(
+                asyncio.gather(_drain(proc.stdout), _drain(proc.stderr), proc.wait()),
                 timeout=timeout
             )
         except asyncio.TimeoutError:
@@ -138,12 +164,12 @@ async def run_command(
             timed_out = True
             stdout = b""
             stderr = b"Command timed out"
+            out_truncated = err_truncated = False
         
-        # Decode output, truncating if too large
-        stdout_str = stdout[:MAX_OUTPUT_SIZE].decode("utf-8", errors="replace")
-        stderr_str = stderr[:MAX_OUTPUT_SIZE].decode("utf-8", errors="replace")
+        stdout_str = stdout.decode("utf-8", errors="replace")
+        stderr_str = stderr.decode("utf-8", errors="replace")
         
-        truncated = len(stdout) > MAX_OUTPUT_SIZE or len(stderr) > MAX_OUTPUT_SIZE
+        truncated = out_truncated or err_truncated
         
         return ToolResult(
             success=proc.returncode == 0 and not timed_out,
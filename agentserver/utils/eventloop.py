@@ -0,0 +1,39 @@
+"""
+eventloop.py — Opt into a faster asyncio event loop when one is installed.
+
+uvloop (Linux/macOS) and winloop (Windows) implement the loop, transports and
+timers over libuv, which speeds up the small-message WebSocket round trips
+the console and server live on. Neither is required — without them the
+stock asyncio loop is used.
+
+Set XMLP_NO_UVLOOP=1 to force the stock loop (e.g. while debugging).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from typing import Optional
+
+
+def install_fast_event_loop() -> Optional[str]:
+    """
+    Install uvloop/winloop as the asyncio event loop policy.
+
+    Call once, before asyncio.run().
+
+    Returns:
+        Name of the installed loop, or None if the stock loop is kept.
+    """
+    if os.environ.get("XMLP_NO_UVLOOP"):
+        return None
+
+    module_name = "winloop" if sys.platform == "win32" else "uvloop"
+    try:
+        module = __import__(module_name)
+    except ImportError:
+        return None
+
+    asyncio.set_event_loop_policy(module.EventLoopPolicy())
+    return module_name
@@ -0,0 +1,68 @@
+"""
+framing.py — Wire encoding for the console/GUI WebSocket command channel.
+
+Commands and replies are small dicts. By default they travel as JSON text
+frames. When msgpack is installed, the client offers the xmlp.msgpack.v1
+subprotocol; if the server accepts it, commands switch to binary MessagePack
+frames. The server always replies in the framing the command arrived in.
+
+The initial {"type": "connected"} handshake stays JSON so older clients
+keep working.
+
+JSON itself goes through orjson when it is installed (stdlib json otherwise);
+both ends of the channel and the REST API share these helpers.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# WebSocket subprotocol advertised for binary framing (version is in the name)
+MSGPACK_PROTOCOL = "xmlp.msgpack.v1"
+
+# Subprotocols this side can speak, in preference order
+SUPPORTED_PROTOCOLS: tuple[str, ...] = (MSGPACK_PROTOCOL,) if MSGPACK_AVAILABLE else ()
+
+
+def pack(obj: Any) -> bytes:
+    """Encode a command/response for a binary frame."""
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    """Decode a binary frame back into a command/response."""
+    return msgpack.unpackb(data, raw=False)
+
+
+if ORJSON_AVAILABLE:
+    def dumps_json(obj: Any) -> str:
+        """Encode a command/response for a JSON text frame."""
+        return orjson.dumps(obj).decode()
+
+    # orjson produces UTF-8 bytes directly — what an HTTP body needs
+    encode_json = orjson.dumps
+    loads_json = orjson.loads
+else:
+    def dumps_json(obj: Any) -> str:
+        """Encode a command/response for a JSON text frame."""
+        return json.dumps(obj)
+
+    def encode_json(obj: Any) -> bytes:
+        """Encode an HTTP response body as UTF-8 JSON."""
+        return json.dumps(obj).encode()
+
+    loads_json = json.loads
@@ -0,0 +1,46 @@
+"""
+ids.py — Cheap UUID v4 strings for per-message identifiers.
+
+str(uuid.uuid4()) costs an os.urandom(16) syscall plus a UUID object per
+call. The message bus mints thread IDs on every hop, so uuid4_str() draws
+its randomness from a per-thread buffer refilled 64 IDs at a time and
+formats the string directly from the bytes.
+
+The output is indistinguishable from str(uuid.uuid4()): canonical
+lowercase, version 4, RFC 4122 variant.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+_BUFFER_SIZE = 16 * 64
+
+_local = threading.local()
+
+
+def _reset_after_fork() -> None:
+    # A forked child must not replay the parent's buffered randomness
+    global _local
+    _local = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def uuid4_str() -> str:
+    """Return a new random UUID v4 as a canonical string."""
+    local = _local
+    i = getattr(local, "i", _BUFFER_SIZE)
+    if i >= _BUFFER_SIZE:
+        local.buf = os.urandom(_BUFFER_SIZE)
+        i = 0
+    b = bytearray(local.buf[i:i + 16])
+    local.i = i + 16
+
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
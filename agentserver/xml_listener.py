@@ -12,6 +12,11 @@ class XMLListener:
     Now supports Autonomous Registration via Pydantic payload classes.
     """
 
+    __slots__ = (
+        "agent_name", "payload_class", "handler", "description",
+        "root_tag", "listens_to",
+    )
+
     def __init__(
         self,
         name: str,
@@ -24,6 +24,8 @@ from pathlib import Path
 
 from agentserver.message_bus import bootstrap
 from agentserver.console.console_registry import set_console
+from agentserver.tools import close_http_session
+from agentserver.utils.eventloop import install_fast_event_loop
 
 
 async def run_organism(config_path: str = "config/organism.yaml", use_simple: bool = False):
@@ -51,6 +53,8 @@ async def run_organism(config_path: str = "config/organism.yaml", use_simple: bo
             except asyncio.CancelledError:
                 pass
             await pump.shutdown()
+            # Handlers' HTTP tools share one client session
+            await close_http_session()
         print("Goodbye!")
     else:
         # Use new TUI console
@@ -70,6 +74,8 @@ async def run_organism(config_path: str = "config/organism.yaml", use_simple: bo
             except asyncio.CancelledError:
                 pass
             await pump.shutdown()
+            # Handlers' HTTP tools share one client session
+            await close_http_session()
 
 
 def main():
@@ -84,6 +90,8 @@ def main():
         print(f"Config not found: {config_path}")
         sys.exit(1)
 
+    install_fast_event_loop()
+
     try:
         asyncio.run(run_organism(config_path, use_simple=use_simple))
     except KeyboardInterrupt:
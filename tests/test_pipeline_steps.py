@@ -149,6 +149,19 @@ class TestRepairStep:
         assert result.raw_bytes is None
         assert result.envelope_tree is not None
 
+    @pytest.mark.asyncio
+    async def test_large_message_parsed_off_loop(self):
+        """Messages over the offload threshold parse on the xml worker pool."""
+        from agentserver.message_bus.xml_executor import OFFLOAD_THRESHOLD
+
+        body = b"<item>x</item>" * (OFFLOAD_THRESHOLD // 14 + 1)
+        state = MessageState(raw_bytes=b"<root>" + body + b"</root>")
+        result = await repair_step(state)
+
+        assert result.error is None
+        assert result.envelope_tree.tag == "root"
+        assert len(result.envelope_tree) > OFFLOAD_THRESHOLD // 14
+
 
 # ============================================================================
 # c14n_step Tests
@@ -315,6 +328,91 @@ class TestPayloadExtractionStep:
         assert result.error is not None
         assert "from" in result.error.lower()
 
+    @pytest.mark.asyncio
+    async def test_meta_after_payload(self):
+        """<meta> after the payload is still found (the scan keeps going for it)."""
+        meta_last = b'''
+        <message xmlns="https://xml-pipeline.org/ns/envelope/v1">
+            <payload xmlns="">data</payload>
+            <meta>
+                <from>test</from>
+                <thread>uuid-here</thread>
+            </meta>
+        </message>'''
+
+        state = MessageState(raw_bytes=meta_last)
+        state = await repair_step(state)
+        state = await c14n_step(state)
+        result = await payload_extraction_step(state)
+
+        assert result.error is None
+        assert result.payload_tree.tag == "payload"
+        assert result.from_id == "test"
+
+    @pytest.mark.asyncio
+    async def test_multiple_payloads_before_meta_error(self):
+        """Two payloads ahead of <meta> are still reported as multiple roots."""
+        payloads_first = b'''
+        <message xmlns="https://xml-pipeline.org/ns/envelope/v1">
+            <payload1>data</payload1>
+            <payload2>more data</payload2>
+            <meta>
+                <from>test</from>
+                <thread>uuid-here</thread>
+            </meta>
+        </message>'''
+
+        state = MessageState(raw_bytes=payloads_first)
+        state = await repair_step(state)
+        state = await c14n_step(state)
+        result = await payload_extraction_step(state)
+
+        assert result.error is not None
+        assert "multiple payload" in result.error.lower()
+
+    @pytest.mark.asyncio
+    async def test_many_payloads_stop_at_second(self):
+        """The scan stops at the second payload; what follows cannot change the outcome."""
+        many = b'''
+        <message xmlns="https://xml-pipeline.org/ns/envelope/v1">
+            <meta>
+                <from>test</from>
+                <thread>uuid-here</thread>
+            </meta>
+            <payload1>data</payload1>
+            <payload2>more data</payload2>
+            <payload3>even more</payload3>
+            <meta>
+                <from>late</from>
+            </meta>
+        </message>'''
+
+        state = MessageState(raw_bytes=many)
+        state = await repair_step(state)
+        state = await c14n_step(state)
+        result = await payload_extraction_step(state)
+
+        assert result.error is not None
+        assert "multiple payload" in result.error.lower()
+        assert result.from_id == "test"
+
+    @pytest.mark.asyncio
+    async def test_missing_meta_with_multiple_payloads_error(self):
+        """Without <meta> the scan never breaks early, and missing <meta> is reported first."""
+        no_meta = b'''
+        <message xmlns="https://xml-pipeline.org/ns/envelope/v1">
+            <payload1>data</payload1>
+            <payload2>more data</payload2>
+        </message>'''
+
+        state = MessageState(raw_bytes=no_meta)
+        state = await repair_step(state)
+        state = await c14n_step(state)
+        result = await payload_extraction_step(state)
+
+        assert result.error is not None
+        assert "meta" in result.error.lower()
+
 
 # ============================================================================
 # thread_assignment_step Tests
@@ -359,6 +457,19 @@ class TestThreadAssignmentStep:
         assert len(diagnostics) > 0
         assert "bad-uuid" in diagnostics[0]
 
+    @pytest.mark.asyncio
+    async def test_generated_uuid_is_canonical_v4(self, empty_state):
+        """Generated IDs should pass the step's own validation, across buffer refills."""
+        from agentserver.message_bus.steps.thread_assignment import _is_valid_uuid
+        from agentserver.utils.ids import uuid4_str
+
+        result = await thread_assignment_step(empty_state)
+        assert _is_valid_uuid(result.thread_id)
+
+        ids = [uuid4_str() for _ in range(200)]
+        assert all(_is_valid_uuid(i) for i in ids)
+        assert len(set(ids)) == len(ids)
+
 
 # ============================================================================
 # Multi-Payload Extraction Tests (standalone, no aiostream required)
@@ -596,6 +707,28 @@ class TestPipelineIntegration:
         assert state.thread_id is not None
         assert state.from_id is not None
 
+    @requires_stream_pump
+    @pytest.mark.asyncio
+    async def test_large_envelope_prepared_off_loop(self):
+        """repair → c14n → envelope.xsd run together on an xml worker for large messages."""
+        from agentserver.message_bus.stream_pump import prepare_envelope_step
+        from agentserver.message_bus.xml_executor import OFFLOAD_THRESHOLD
+
+        body = b"<a>5</a>" * (OFFLOAD_THRESHOLD // 8 + 1)
+        state = MessageState(raw_bytes=(
+            b'<message xmlns="https://xml-pipeline.org/ns/envelope/v1"><meta>'
+            b'<from>calculator.add</from>'
+            b'<thread>550e8400-e29b-41d4-a716-446655440000</thread></meta>'
+            b'<addpayload xmlns="https://xml-pipeline.org/ns/calculator/add/v1">'
+            + body + b'</addpayload></message>'
+        ))
+
+        result = await prepare_envelope_step(state)
+
+        assert result.error is None, f"prepare failed: {result.error}"
+        assert result.raw_bytes is None
+        assert result.envelope_tree is not None
+
     @pytest.mark.asyncio
     async def test_error_short_circuits(self):
         """Errors should prevent downstream steps from running."""
@@ -378,6 +378,39 @@ class TestErrorHandling:
         # Should have a routing error
         assert any("nonexistent" in e for e in errors)
 
+    @pytest.mark.asyncio
+    async def test_error_reports_flushed_on_shutdown(self, capsys):
+        """Queued error reports are written out by shutdown()."""
+        pump = StreamPump(OrganismConfig(name="test-error-log"))
+
+        for i in range(3):
+            await pump._handle_errors(MessageState(thread_id=f"t{i}", error=f"boom {i}"))
+        await pump.shutdown()
+
+        out = capsys.readouterr().out
+        assert out == "[ERROR] t0: boom 0\n[ERROR] t1: boom 1\n[ERROR] t2: boom 2\n"
+        assert pump._error_writer is None
+
+    @pytest.mark.asyncio
+    async def test_error_reports_dropped_when_queue_full(self, capsys, monkeypatch):
+        """Reports past the queue bound are counted, and the count is reported."""
+        from agentserver.message_bus import stream_pump
+        monkeypatch.setattr(stream_pump, "ERROR_LOG_QUEUE_SIZE", 2)
+        pump = StreamPump(OrganismConfig(name="test-error-log"))
+
+        # _handle_errors never yields, so the writer gets no chance to drain
+        for i in range(5):
+            await pump._handle_errors(MessageState(thread_id=f"t{i}", error="boom"))
+        assert pump.dropped_error_reports == 3
+
+        await pump.shutdown()
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == [
+            "[ERROR] t0: boom",
+            "[ERROR] t1: boom",
+            "[ERROR] 3 error report(s) dropped",
+        ]
+
 
 class TestThreadRoutingFlow:
     """
@@ -776,3 +809,39 @@ class TestManualPumpConfiguration:
         # Custom handler should have been called
         assert len(responses) == 1
         assert responses[0].name == "Custom"
+
+    @pytest.mark.asyncio
+    async def test_broadcast_yields_responses_as_they_complete(self):
+        """Broadcast listeners run concurrently; a slow one doesn't delay the rest."""
+        config = OrganismConfig(name="broadcast-test")
+        pump = StreamPump(config)
+
+        async def slow_handler(payload, metadata):
+            await asyncio.sleep(0.2)
+            return b"<Slow/>"
+
+        async def fast_handler(payload, metadata):
+            return b"<Fast/>"
+
+        listeners = []
+        for name, handler in (("slow", slow_handler), ("fast", fast_handler)):
+            listeners.append(pump.register_listener(ListenerConfig(
+                name=name,
+                payload_class_path="handlers.hello.Greeting",
+                handler_path="handlers.hello.handle_greeting",
+                description="Broadcast listener",
+                payload_class=Greeting,
+                handler=handler,
+            )))
+
+        state = MessageState(
+            payload=Greeting(name="Everyone"),
+            thread_id=str(uuid.uuid4()),
+            from_id="tester",
+            target_listeners=tuple(listeners),
+        )
+
+        responses = [resp async for resp in pump._dispatch_to_handlers(state)]
+
+        assert [r.from_id for r in responses] == ["fast", "slow"]
+        assert responses[0].raw_bytes == b"<Fast/>"
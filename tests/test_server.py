@@ -0,0 +1,413 @@
+"""
+test_server.py — Tests for session auth and the aiohttp server
+
+Run with: pytest tests/test_server.py -v
+
+The HTTP/WebSocket tests drive create_app() in-process through aiohttp's
+test client, with a fresh SessionManager per test.
+"""
+
+import asyncio
+import gc
+import pytest
+import weakref
+from datetime import timedelta
+
+from agentserver.auth.sessions import SessionManager
+from agentserver.utils import framing
+
+# Check for optional dependencies
+try:
+    from aiohttp.test_utils import TestClient, TestServer
+    from agentserver.server import app as server_app
+    from agentserver.server.app import create_app, EncodedReply, handle_ws_msg
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+requires_aiohttp = pytest.mark.skipif(
+    not HAS_AIOHTTP,
+    reason="aiohttp not installed (pip install xml-pipeline[server])"
+)
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def session_manager():
+    """A SessionManager not shared with the rest of the process."""
+    return SessionManager()
+
+
+@pytest.fixture
+async def client(session_manager):
+    """Test client for an app with no pump, using session_manager."""
+    app = create_app()
+    app["session_manager"] = session_manager
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+def bearer(session):
+    return {"Authorization": f"Bearer {session.token}"}
+
+
+class FakePump:
+    """Just enough of StreamPump for the listeners reply."""
+
+    def __init__(self, *names):
+        self.listeners = dict.fromkeys(names)
+        self.listeners_version = 0
+
+    def register(self, name):
+        self.listeners[name] = None
+        self.listeners_version += 1
+
+
+async def open_ws(client, session_manager, **kwargs):
+    """Connect to /ws and consume the "connected" greeting."""
+    session = session_manager.create("alice", "admin")
+    ws = await client.ws_connect("/ws", headers=bearer(session), **kwargs)
+    greeting = await ws.receive_json()
+    assert greeting == {"type": "connected", "username": "alice"}
+    return ws
+
+
+# ============================================================================
+# SessionManager Tests
+# ============================================================================
+
+class TestSessionRefresh:
+    """Tests for SessionManager.refresh (token rotation)."""
+
+    def test_refresh_issues_new_token(self, session_manager):
+        """A refreshed session keeps the user and role under a new token."""
+        old = session_manager.create("alice", "admin")
+        new = session_manager.refresh(old.token)
+
+        assert new is not None
+        assert new.token != old.token
+        assert (new.username, new.role) == ("alice", "admin")
+        assert session_manager.validate(new.token) is new
+
+    def test_refresh_revokes_old_token(self, session_manager):
+        """The old token stops working as soon as it is exchanged."""
+        old = session_manager.create("alice", "admin")
+        session_manager.refresh(old.token)
+
+        assert session_manager.validate(old.token) is None
+        assert session_manager.refresh(old.token) is None
+
+    def test_refresh_unknown_token(self, session_manager):
+        """An unknown token cannot be refreshed."""
+        assert session_manager.refresh("not-a-token") is None
+
+    def test_refresh_expired_token(self, session_manager):
+        """An expired token cannot be refreshed."""
+        old = session_manager.create("alice", "admin", lifetime=timedelta(seconds=-1))
+        assert session_manager.refresh(old.token) is None
+
+
+# ============================================================================
+# HTTP Endpoint Tests
+# ============================================================================
+
+@requires_aiohttp
+class TestRefreshEndpoint:
+    """Tests for POST /auth/refresh."""
+
+    async def test_refresh_returns_new_token(self, client, session_manager):
+        """A valid Bearer token is exchanged for a new one."""
+        old = session_manager.create("alice", "admin")
+        resp = await client.post("/auth/refresh", headers=bearer(old))
+
+        assert resp.status == 200
+        data = await resp.json()
+        assert data["token"] != old.token
+        assert data["username"] == "alice"
+        assert "expires_at" in data
+
+        # Only the new token is accepted afterwards
+        resp = await client.get("/auth/me", headers={"Authorization": f"Bearer {data['token']}"})
+        assert resp.status == 200
+        resp = await client.get("/auth/me", headers=bearer(old))
+        assert resp.status == 401
+
+    async def test_refresh_requires_auth(self, client):
+        """Without a token the middleware rejects the request."""
+        resp = await client.post("/auth/refresh")
+        assert resp.status == 401
+        assert await resp.json() == {"error": "Missing Authorization"}
+
+    async def test_refresh_rejects_unknown_token(self, client):
+        """An unknown token gets 401."""
+        resp = await client.post("/auth/refresh", headers={"Authorization": "Bearer nope"})
+        assert resp.status == 401
+        assert await resp.json() == {"error": "Invalid token"}
+
+
+# ============================================================================
+# WebSocket Reply Tests
+# ============================================================================
+
+@requires_aiohttp
+class TestEncodedReplies:
+    """Tests for replies encoded once and reused (pong, listeners)."""
+
+    async def test_ping_returns_shared_pong(self):
+        """Every ping gets the same pre-encoded reply."""
+        first = await handle_ws_msg({"type": "ping"}, None, None, None, {})
+        second = await handle_ws_msg({"type": "ping"}, None, None, None, {})
+
+        assert isinstance(first, EncodedReply)
+        assert first is second
+        assert framing.loads_json(first.text) == {"type": "pong"}
+
+    async def test_listeners_reply_cached_per_version(self):
+        """The listeners reply is reused until the pump's listener set changes."""
+        pump = FakePump("greeter")
+        first = await handle_ws_msg({"type": "listeners"}, None, pump, None, {})
+        again = await handle_ws_msg({"type": "targets"}, None, pump, None, {})
+        assert again is first
+        assert framing.loads_json(first.text) == {"type": "listeners", "listeners": ["greeter"]}
+
+        pump.register("shouter")
+        changed = await handle_ws_msg({"type": "listeners"}, None, pump, None, {})
+        assert changed is not first
+        assert framing.loads_json(changed.text)["listeners"] == ["greeter", "shouter"]
+
+    async def test_listeners_cache_is_per_pump(self):
+        """Two pumps never see each other's cached reply."""
+        a, b = FakePump("a"), FakePump("b")
+        reply_a = await handle_ws_msg({"type": "listeners"}, None, a, None, {})
+        reply_b = await handle_ws_msg({"type": "listeners"}, None, b, None, {})
+        assert framing.loads_json(reply_a.text)["listeners"] == ["a"]
+        assert framing.loads_json(reply_b.text)["listeners"] == ["b"]
+
+    async def test_listeners_cache_does_not_keep_pump_alive(self):
+        """The cache holds pumps weakly."""
+        pump = FakePump("greeter")
+        await handle_ws_msg({"type": "listeners"}, None, pump, None, {})
+        ref = weakref.ref(pump)
+        del pump
+        gc.collect()
+        assert ref() is None
+
+    async def test_encoded_reply_sent_over_websocket(self, client, session_manager):
+        """handle_websocket sends the stored JSON frame for an EncodedReply."""
+        client.server.app["pump"] = FakePump("greeter")
+        ws = await open_ws(client, session_manager)
+
+        await ws.send_json({"type": "ping"})
+        assert await ws.receive_str() == server_app._PONG.text
+        await ws.send_json({"type": "listeners"})
+        assert await ws.receive_json() == {"type": "listeners", "listeners": ["greeter"]}
+        await ws.close()
+
+
+@requires_aiohttp
+class TestWebSocketErrors:
+    """Tests for error frames and the malformed-frame limit."""
+
+    async def test_error_frame_json(self, client, session_manager):
+        """A malformed text frame gets a JSON error built from the prefix."""
+        ws = await open_ws(client, session_manager)
+
+        await ws.send_str("not json")
+        reply = await ws.receive_str()
+        assert reply.startswith(server_app._ERROR_TEXT_PREFIX)
+        data = framing.loads_json(reply)
+        assert data["type"] == "error"
+        assert data["error"].startswith("Malformed frame: ")
+
+        await ws.send_str("[1, 2]")
+        assert await ws.receive_json() == {"type": "error", "error": "Malformed frame: Expected an object"}
+        await ws.close()
+
+    async def test_error_frame_escapes_message(self):
+        """The error text is JSON-encoded into the prefixed frame, not pasted."""
+        sent = []
+
+        class Recorder:
+            async def send_str(self, text):
+                sent.append(text)
+
+        await server_app._send_error(Recorder(), 'bad "quote" \\ é', binary=False)
+        assert framing.loads_json(sent[0]) == {"type": "error", "error": 'bad "quote" \\ é'}
+
+    @pytest.mark.skipif(not framing.MSGPACK_AVAILABLE, reason="msgpack not installed")
+    async def test_error_frame_msgpack(self):
+        """The packed prefix plus a packed string is a valid msgpack map."""
+        sent = []
+
+        class Recorder:
+            async def send_bytes(self, data):
+                sent.append(data)
+
+        await server_app._send_error(Recorder(), "bad é", binary=True)
+        assert framing.unpack(sent[0]) == {"type": "error", "error": "bad é"}
+
+    async def test_unnegotiated_binary_frame_gets_error(self, client, session_manager):
+        """Binary input on a JSON connection is answered, not silently dropped."""
+        ws = await open_ws(client, session_manager)
+
+        await ws.send_bytes(b"\x81\xa4type\xa4ping")
+        data = await ws.receive_json()
+        assert data["type"] == "error"
+        assert framing.MSGPACK_PROTOCOL in data["error"]
+        await ws.close()
+
+    async def test_close_after_malformed_burst(self, client, session_manager):
+        """WS_MAX_MALFORMED bad frames within the window close the socket."""
+        ws = await open_ws(client, session_manager)
+
+        for _ in range(server_app.WS_MAX_MALFORMED - 1):
+            await ws.send_str("garbage")
+            assert (await ws.receive_json())["type"] == "error"
+
+        await ws.send_str("garbage")
+        msg = await ws.receive()
+        assert msg.type == server_app.WSMsgType.CLOSE
+        assert ws.close_code == server_app.WSCloseCode.POLICY_VIOLATION
+
+    async def test_spread_out_malformed_frames_tolerated(self, client, session_manager, monkeypatch):
+        """Bad frames further apart than the window never close the socket."""
+        monkeypatch.setattr(server_app, "WS_MAX_MALFORMED", 3)
+        monkeypatch.setattr(server_app, "WS_MALFORMED_WINDOW", 0.05)
+        ws = await open_ws(client, session_manager)
+
+        for _ in range(6):
+            await ws.send_str("garbage")
+            assert (await ws.receive_json())["type"] == "error"
+            await asyncio.sleep(0.03)
+
+        # Still open and serving commands
+        await ws.send_json({"type": "ping"})
+        assert await ws.receive_json() == {"type": "pong"}
+        await ws.close()
+
+
+# ============================================================================
+# Framing / Subprotocol Negotiation Tests
+# ============================================================================
+
+requires_msgpack = pytest.mark.skipif(
+    not framing.MSGPACK_AVAILABLE,
+    reason="msgpack not installed (pip install msgpack)"
+)
+
+
+class TestFraming:
+    """Tests for the wire codecs in utils/framing.py."""
+
+    def test_json_round_trip(self):
+        """dumps_json/loads_json round-trip a command; encode_json gives bytes."""
+        cmd = {"type": "send", "target": "greeter", "content": "héllo"}
+        assert framing.loads_json(framing.dumps_json(cmd)) == cmd
+        assert isinstance(framing.encode_json(cmd), bytes)
+        assert framing.loads_json(framing.encode_json(cmd)) == cmd
+
+    @requires_msgpack
+    def test_msgpack_round_trip(self):
+        """pack/unpack round-trip a command with str keys and values."""
+        cmd = {"type": "send", "raw": "@greeter héllo", "n": [1, 2]}
+        assert framing.unpack(framing.pack(cmd)) == cmd
+
+    def test_supported_protocols_follow_msgpack(self):
+        """The msgpack subprotocol is only offered when msgpack is installed."""
+        assert (framing.MSGPACK_PROTOCOL in framing.SUPPORTED_PROTOCOLS) == framing.MSGPACK_AVAILABLE
+
+
+@requires_aiohttp
+@requires_msgpack
+class TestSubprotocolNegotiation:
+    """Tests for xmlp.msgpack.v1 negotiation and reply-in-kind."""
+
+    async def test_msgpack_negotiated(self, client, session_manager):
+        """Offering the subprotocol switches the connection to msgpack."""
+        ws = await open_ws(client, session_manager, protocols=[framing.MSGPACK_PROTOCOL])
+        assert ws.protocol == framing.MSGPACK_PROTOCOL
+
+        await ws.send_bytes(framing.pack({"type": "ping"}))
+        assert framing.unpack(await ws.receive_bytes()) == {"type": "pong"}
+        await ws.close()
+
+    async def test_handshake_stays_json(self, client, session_manager):
+        """The "connected" greeting is a JSON text frame even under msgpack."""
+        session = session_manager.create("alice", "admin")
+        ws = await client.ws_connect("/ws", headers=bearer(session), protocols=[framing.MSGPACK_PROTOCOL])
+        assert ws.protocol == framing.MSGPACK_PROTOCOL
+
+        msg = await ws.receive()
+        assert msg.type == server_app.WSMsgType.TEXT
+        assert framing.loads_json(msg.data) == {"type": "connected", "username": "alice"}
+        await ws.close()
+
+    async def test_reply_in_kind(self, client, session_manager):
+        """On a msgpack connection, a text command still gets a text reply."""
+        client.server.app["pump"] = FakePump("greeter")
+        ws = await open_ws(client, session_manager, protocols=[framing.MSGPACK_PROTOCOL])
+
+        await ws.send_json({"type": "listeners"})
+        assert await ws.receive_json() == {"type": "listeners", "listeners": ["greeter"]}
+        await ws.send_bytes(framing.pack({"type": "listeners"}))
+        assert framing.unpack(await ws.receive_bytes()) == {"type": "listeners", "listeners": ["greeter"]}
+        await ws.close()
+
+    async def test_json_fallback_without_offer(self, client, session_manager):
+        """A client that offers no subprotocol stays on JSON."""
+        ws = await open_ws(client, session_manager)
+        assert ws.protocol is None
+
+        await ws.send_json({"type": "ping"})
+        assert await ws.receive_json() == {"type": "pong"}
+        await ws.close()
+
+    async def test_json_fallback_on_unknown_protocol(self, client, session_manager):
+        """An unknown subprotocol is not accepted; the connection stays on JSON."""
+        ws = await open_ws(client, session_manager, protocols=["xmlp.other.v9"])
+        assert ws.protocol is None
+
+        await ws.send_json({"type": "ping"})
+        assert await ws.receive_json() == {"type": "pong"}
+        await ws.close()
+
+
+# ============================================================================
+# Login Endpoint Tests
+# ============================================================================
+
+@requires_aiohttp
+class TestLoginBodyLimit:
+    """Tests for the LOGIN_MAX_BODY cap on POST /auth/login."""
+
+    async def test_oversized_body_rejected(self, client):
+        """A body over LOGIN_MAX_BODY gets 413 without being parsed."""
+        body = b'{"username": "' + b"a" * server_app.LOGIN_MAX_BODY + b'", "password": "x"}'
+        resp = await client.post("/auth/login", data=body)
+        assert resp.status == 413
+
+    async def test_oversized_chunked_body_rejected(self, client):
+        """Without a Content-Length the cap still applies to the bytes read."""
+        async def chunks():
+            for _ in range(3):
+                yield b"a" * server_app.LOGIN_MAX_BODY
+
+        resp = await client.post("/auth/login", data=chunks())
+        assert resp.status == 413
+
+    async def test_body_at_limit_is_parsed(self, client):
+        """A body within the cap reaches the JSON parser."""
+        body = b" " * (server_app.LOGIN_MAX_BODY - 2) + b"{}"
+        resp = await client.post("/auth/login", data=body)
+        assert resp.status == 400
+        assert await resp.json() == {"error": "Credentials required"}
+
+    async def test_invalid_json_rejected(self, client):
+        """A body that is not a JSON object gets 400 Invalid JSON."""
+        for body in (b"{nope", b"[1, 2]"):
+            resp = await client.post("/auth/login", data=body)
+            assert resp.status == 400
+            assert await resp.json() == {"error": "Invalid JSON"}
@@ -0,0 +1,165 @@
+"""
+test_tools.py — Tests for the native tools (shell, calculate)
+
+Run with: pytest tests/test_tools.py -v
+"""
+
+import asyncio
+import math
+import sys
+
+import pytest
+
+from agentserver.tools import shell, calculate
+from agentserver.tools.calculate import SafeEvaluator, safe_eval, _parse
+
+
+# ============================================================================
+# run_command
+# ============================================================================
+
+@pytest.fixture
+def default_shell_config():
+    """Restore the shell allow/block lists after a test reconfigures them."""
+    allowed, blocked = shell.ALLOWED_COMMANDS, shell.BLOCKED_COMMANDS
+    yield
+    shell.ALLOWED_COMMANDS, shell.BLOCKED_COMMANDS = allowed, blocked
+
+
+class TestShellGate:
+    """Tests for _validate_command's allow/block lists and operator check."""
+
+    def test_blocked_command_by_basename(self):
+        """A blocked executable is caught whatever path it is run from."""
+        assert shell._validate_command("rm -rf /") == "Command 'rm' is blocked for security"
+        assert shell._validate_command("/bin/RM x") == "Command 'rm' is blocked for security"
+
+    def test_unblocked_command_passes(self):
+        """An ordinary command passes the gate."""
+        assert shell._validate_command("ls -l") is None
+
+    def test_longest_operator_reported(self):
+        """'||' is reported as itself, not as '|'."""
+        assert shell._validate_command("echo a || b") == "Shell operator '||' not allowed"
+        assert shell._validate_command("echo a | b") == "Shell operator '|' not allowed"
+        assert shell._validate_command("echo $(id)") == "Shell operator '$(' not allowed"
+
+    def test_command_lists_cannot_be_mutated(self):
+        """The lists are immutable, so the gate never diverges from them."""
+        with pytest.raises(AttributeError):
+            shell.BLOCKED_COMMANDS.add("curl")
+        with pytest.raises(AttributeError):
+            shell.ALLOWED_COMMANDS.add("curl")
+
+    def test_configure_blocked_commands(self, default_shell_config):
+        """configure_blocked_commands replaces the blocklist."""
+        shell.configure_blocked_commands(["curl"])
+        assert shell._validate_command("curl x") == "Command 'curl' is blocked for security"
+        assert shell._validate_command("rm x") is None
+
+    def test_configure_allowed_commands(self, default_shell_config):
+        """With an allowlist set, anything not on it is refused."""
+        shell.configure_allowed_commands(["ls"])
+        assert shell._validate_command("ls") is None
+        assert shell._validate_command("echo hi") == "Command 'echo' not in allowlist"
+
+
+class TestDrain:
+    """Tests for run_command's bounded pipe reader."""
+
+    @staticmethod
+    def reader_with(*chunks):
+        reader = asyncio.StreamReader()
+        for chunk in chunks:
+            reader.feed_data(chunk)
+        reader.feed_eof()
+        return reader
+
+    async def test_output_under_cap_kept_whole(self, monkeypatch):
+        """Output within MAX_OUTPUT_SIZE comes back unchanged."""
+        monkeypatch.setattr(shell, "MAX_OUTPUT_SIZE", 10)
+        assert await shell._drain(self.reader_with(b"hello", b"world")) == (b"helloworld", False)
+
+    async def test_output_over_cap_truncated(self, monkeypatch):
+        """Only the first MAX_OUTPUT_SIZE bytes are kept; the rest is read and dropped."""
+        monkeypatch.setattr(shell, "MAX_OUTPUT_SIZE", 8)
+        monkeypatch.setattr(shell, "READ_CHUNK", 4)
+        reader = self.reader_with(b"0123456789", b"abcdef")
+
+        assert await shell._drain(reader) == (b"01234567", True)
+        assert reader.at_eof()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX head and /dev/zero")
+    async def test_run_command_truncates_large_output(self, monkeypatch):
+        """run_command caps stdout and flags it, with the process left to finish."""
+        monkeypatch.setattr(shell, "MAX_OUTPUT_SIZE", 1000)
+        result = await shell.run_command(command="head -c 100000 /dev/zero")
+
+        assert result.success
+        assert result.data["exit_code"] == 0
+        assert len(result.data["stdout"]) == 1000
+        assert result.data["truncated"] is True
+
+
+# ============================================================================
+# calculate
+# ============================================================================
+
+class TestCalculate:
+    """Tests for the AST evaluator behind the calculate tool."""
+
+    def setup_method(self):
+        _parse.cache_clear()
+
+    def test_evaluates_expressions(self):
+        """Operators, functions, constants, comparisons and ternaries."""
+        assert safe_eval("(10 + 5) * 3") == 45
+        assert safe_eval("2 ** 10 // 3 % 7") == 341 % 7
+        assert safe_eval("max(1, 2, 3) + -abs(-4)") == -1
+        assert safe_eval("sqrt(16) + pi") == 4 + math.pi
+        assert safe_eval("1 < 2 <= 2 != 3") is True
+        assert safe_eval("1 if 2 > 3 else 0") == 0
+
+    def test_parse_cached_per_expression(self):
+        """Repeating an expression reuses its parsed tree."""
+        assert safe_eval("1 + 2") == 3
+        assert safe_eval("1 + 2") == 3
+        assert safe_eval("2 + 2") == 4
+        info = _parse.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+        assert _parse("1 + 2") is _parse("1 + 2")
+
+    def test_syntax_errors_not_cached(self):
+        """A syntax error raises ValueError every time and leaves no entry."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Invalid syntax"):
+                safe_eval("1 +")
+        assert _parse.cache_info().currsize == 0
+
+    def test_visitor_table_covers_visit_methods(self):
+        """Every visit_* method is reachable through the dispatch table."""
+        methods = {name[len("visit_"):] for name in vars(SafeEvaluator) if name.startswith("visit_")}
+        assert set(SafeEvaluator._visitors) == methods
+        assert SafeEvaluator._visitors["BinOp"] is SafeEvaluator.visit_BinOp
+
+    @pytest.mark.parametrize("expression, message", [
+        ("x.real", "Unsupported operation: Attribute"),
+        ("[1, 2]", "Unsupported operation: List"),
+        ("'text'", "Unsupported constant type"),
+        ("foo", "Unknown variable: foo"),
+        ("open('f')", "Unknown function: open"),
+        ("1 & 2", "Unsupported operator: BitAnd"),
+    ])
+    def test_rejects_unsafe_nodes(self, expression, message):
+        """Anything outside the table is refused, including from a cached tree."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match=message):
+                safe_eval(expression)
+
+    @pytest.mark.asyncio
+    async def test_tool_wraps_result(self):
+        """The calculate tool reports results and errors as ToolResults."""
+        ok = await calculate(expression="2 ** 10")
+        assert ok.success and ok.data == 1024
+        failed = await calculate(expression="1 / 0")
+        assert not failed.success and "division by zero" in failed.error
@@ -3,7 +3,7 @@
 from lxml import etree, objectify
 from lxml.etree import _Element
 from lxml.objectify import ObjectifiedElement
-from typing import Type, TypeVar, Any
+from typing import Callable, Type, TypeVar, Any
 from io import BytesIO
 
 from ._xmlify import xmlify
@@ -24,6 +24,23 @@ def parse_element(cls: Type[T], element: _Element | ObjectifiedElement) -> T:
     ctx = XErrorCtx(trace=[cls.__name__])
     return xobject.xml_in(obj_element, ctx=ctx)
 
+def element_parser(cls: Type[T]) -> Callable[[_Element | ObjectifiedElement], T]:
+    """
+    parse_element with the class lookup done once, up front.
+
+    The returned callable skips the objectify round trip for elements that
+    are already objectified.
+    """
+    xml_in = _get_xobject(cls).xml_in
+    name = cls.__name__
+
+    def parse(element: _Element | ObjectifiedElement) -> T:
+        if not isinstance(element, ObjectifiedElement):
+            element = objectify.fromstring(etree.tostring(element))
+        return xml_in(element, ctx=XErrorCtx(trace=[name]))
+
+    return parse
+
 def parse_bytes(cls: Type[T], xml_bytes: bytes) -> T:
     tree = objectify.parse(BytesIO(xml_bytes))
     root = tree.getroot()
@@ -32,4 +49,4 @@ def parse_bytes(cls: Type[T], xml_bytes: bytes) -> T:
 def parse_string(cls: Type[T], xml_str: str) -> T:
     return parse_bytes(cls, xml_str.encode("utf-8"))
 
-__all__ = ["xmlify", "parse_element", "parse_bytes", "parse_string"]
+__all__ = ["xmlify", "parse_element", "element_parser", "parse_bytes", "parse_string"]